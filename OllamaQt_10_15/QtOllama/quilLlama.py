@@ -2,10 +2,17 @@
 import sys
 from asyncio import subprocess
 from datetime import time, datetime
+from time import monotonic
 import os
-import markdown
-import ollama
+import re
 import json
+import logging
+import operator
+import threading
+from collections import Counter, deque
+from itertools import islice
+from functools import lru_cache
+from types import MappingProxyType
 from PyQt6.QtWidgets import (
     QWidget,
     QHBoxLayout,
@@ -26,28 +33,47 @@ from PyQt6.QtWidgets import (
     QMenu,
     QToolButton,
     QFileDialog,)
-from PyQt6.QtCore import QThread, pyqtSignal, QFileInfo, QTimer, Qt, pyqtSlot
-from typing import Dict, Generator
-from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtGui import QCloseEvent, QAction, QFont
-from textblob import TextBlob
-from textstat import textstat
-from QtOllama.ui.stats_dialog import HistoricalStatsDialog
-from QtOllama.ui.wordcloud_dialog import WordCloudDialog
-import QtOllama.utility.capabilities as capabilities
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, QFileInfo, QTimer, Qt, pyqtSlot
+from PyQt6.QtGui import QCloseEvent, QAction, QFont, QTextCursor
 from QtOllama.ui.frameless_window import FramelessWindow
+from QtOllama.utility.interpretations import Interpretations
 from QtOllama.utility.logger_setup import create_logger
-from QtOllama.utility.constants import CONTEXT_LENGTH_DEFAULT
+from QtOllama.utility.constants import (
+    CHARS_PER_TOKEN, CONTEXT_LENGTH_DEBOUNCE_MS, CONTEXT_LENGTH_DEFAULT, KEEP_ALIVE, NUM_BATCH,
+    OLLAMA_CONNECT_TIMEOUT_S, OLLAMA_HEADERS, OLLAMA_READ_TIMEOUT_S, POOL_SHUTDOWN_TIMEOUT_MS,
+    STREAM_BATCH_CHARS, STREAM_FLUSH_INTERVAL_MS, TRIM_LOW_WATERMARK
+)
+from QtOllama.utility.model_cache import load_cached_models, save_cached_models
 from QtOllama.utility.utils import handle_exception
 from QtOllama.ui.ui_components import UIComponents
 from QtOllama.ui.signal_connector import SignalConnector
-from QtOllama.ui.menu_creator import MenuCreator
+from QtOllama.ui.menu_creator import MenuCreator, walk_menus
 from QtOllama.ui.chat_tables import SavedChatsDialog
-from QtOllama.utility.stats import StatsDialog
+from QtOllama.ui.chat_highlighter import ChatHighlighter
 # main_window.py
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
+_TOKEN_RE = re.compile(r"\S+")
+# One markdown converter, created by the first HTML export and reused by the next ones;
+# exports run on the pool, so it is locked
+_MD = None
+_MD_LOCK = threading.Lock()
+_get_name = operator.itemgetter("name")
+
+
+def estimate_tokens(text):
+    """
+    Estimates the number of model tokens in a text from its length.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated token count, rounded up.
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
 
 def messages_to_prompt(messages):
     """
@@ -73,14 +99,187 @@ def messages_to_prompt(messages):
     return prompt
 
 
+def markdown_to_html(text):
+    """
+    Converts markdown to HTML with the shared converter.
+
+    The markdown package is imported, and the converter created, on first use.
+
+    Args:
+        text (str): The markdown to convert.
+
+    Returns:
+        str: The HTML.
+    """
+    global _MD
+    with _MD_LOCK:
+        if _MD is None:
+            import markdown
+
+            _MD = markdown.Markdown()
+        return _MD.reset().convert(text)
+
+
+def iter_markdown(messages):
+    """
+    Yields the markdown used to export a chat, fragment by fragment.
+
+    The role and content of each message are yielded as they are, so no formatted string
+    is built per message and the contents are never copied before they are written.
+
+    Args:
+        messages (list): A list of message dictionaries with 'role' and 'content' keys.
+
+    Yields:
+        str: The fragments of one bold role prefix and its content per message, separated by
+            blank lines.
+    """
+    separator = ""
+    for msg in messages:
+        yield separator
+        yield "**"
+        yield msg["role"]
+        yield "**: "
+        yield msg["content"]
+        separator = "\n\n"
+
+
+def messages_to_markdown(messages):
+    """
+    Converts a list of message dictionaries into the markdown used to export a chat.
+
+    Args:
+        messages (list): A list of message dictionaries with 'role' and 'content' keys.
+
+    Returns:
+        str: One bold role prefix and its content per message, separated by blank lines.
+    """
+    return "".join(iter_markdown(messages))
+
+
+def _freeze(value):
+    """
+    Returns a read-only copy of a nested menu structure.
+
+    Args:
+        value (dict | list): A dict of menus or a list of options.
+
+    Returns:
+        MappingProxyType | tuple: Dicts become read-only mappings, at every level, and lists
+            become tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({name: _freeze(child) for name, child in value.items()})
+    return tuple(value)
+
+
+@lru_cache(maxsize=1)
+def _menus():
+    """
+    Builds the nested menu structure from the capability lists.
+
+    The capability lists are static, so the structure is built once per process and
+    shared, read-only at every level (see _freeze), by every window.
+
+    Returns:
+        MappingProxyType: Menu names mapped to either a nested mapping or a tuple of options.
+    """
+    import QtOllama.utility.capabilities as capabilities
+
+    capabilities_instance = capabilities.Capabilities()
+    return _freeze({
+        "Analyze": {
+            "Prose": {
+                "Textual": capabilities_instance.get_prose_textual_analysis_types(),
+                "Semantic": capabilities_instance.get_prose_semantic_analysis_types(),
+                "Linguistic": capabilities_instance.get_prose_linguistic_analysis_types(),
+                "Cognitive": capabilities_instance.get_prose_cognitive_analysis_types(),
+                "Contextual": capabilities_instance.get_prose_contextual_analysis_types(),
+                "Stylistic": capabilities_instance.get_prose_stylistic_analysis_types(),
+                "Narrative": capabilities_instance.get_prose_narrative_analysis_types()
+            },
+            "Critical": capabilities_instance.get_critical_analysis_types(),
+            "Psychoanalytical": capabilities_instance.get_psychoanalytical_analysis_types(),
+            "Scientific": capabilities_instance.get_scientific_analysis_types(),
+            "Philosophical": capabilities_instance.get_philosophical_analysis_types(),
+            "Statistical": capabilities_instance.get_statistical_analysis_types(),
+            "Opposition": capabilities_instance.get_opposition_analysis_types(),
+            "Code": capabilities_instance.get_code_analysis_types(),
+            "Prompt": capabilities_instance.get_prompt_analysis_types(),
+            "Art Prompt": capabilities_instance.get_art_prompt_analysis_types(),
+            "Poetry": capabilities_instance.get_poetry_analysis_types(),
+        },
+        "Generate": {
+            "Prose": {
+                "Textual": capabilities_instance.get_prose_textual_generation_types(),
+                "Semantic": capabilities_instance.get_prose_semantic_generation_types(),
+                "Cognitive": capabilities_instance.get_prose_cognitive_generation_types(),
+                "Contextual": capabilities_instance.get_prose_contextual_generation_types(),
+                "Stylistic": capabilities_instance.get_prose_stylistic_generation_types(),
+                "Narrative": capabilities_instance.get_prose_narrative_generation_types(),
+            },
+            "Documentation": capabilities_instance.get_documentation_generation_types(),
+            "Prompt": capabilities_instance.get_prompt_generation_types(),
+            "Art Prompt": capabilities_instance.get_art_prompt_generation_types(),
+            "Poetry": capabilities_instance.get_poetry_generation_types(),
+            "Code": capabilities_instance.get_code_generation_types(),
+        },
+        "Transform": {
+            "Prose": {
+                "Textual": capabilities_instance.get_prose_textual_transformation_types(),
+                "Semantic": capabilities_instance.get_prose_semantic_transformation_types(),
+                "Cognitive": capabilities_instance.get_prose_cognitive_transformation_types(),
+                "Contextual": capabilities_instance.get_prose_contextual_transformation_types(),
+                "Stylistic": capabilities_instance.get_prose_stylistic_transformation_types(),
+                "Narrative": capabilities_instance.get_prose_narrative_transformation_types(),
+            },
+            "Scaling": capabilities_instance.get_text_scaling_types(),
+            "Enhancement": capabilities_instance.get_text_enhancement_types(),
+            "Prompt": capabilities_instance.get_prompt_transformation_types(),
+            "Art Prompt": capabilities_instance.get_art_prompt_transformation_types(),
+            "Poetry": capabilities_instance.get_poetry_transformation_types(),
+            "Code": capabilities_instance.get_code_transformation_types(),
+        },
+    })
+
+
+@lru_cache(maxsize=1)
+def _menu_spec():
+    """
+    Flattens the menu structure into (path, kind, payload) triples, see walk_menus.
+
+    Returns:
+        tuple: The (path, kind, payload) triples of every menu and menu action.
+    """
+    return tuple(walk_menus(_menus()))
+
+
+def _word_count(text):
+    """
+    Returns the number of whitespace-separated words in the text, without building the
+    list split() would return.
+
+    Args:
+        text (str): The text to count.
+
+    Returns:
+        int: The number of words.
+    """
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
 class MainWindow(FramelessWindow, QMainWindow):
     def __init__(self, *args, **kwargs):
         try:
             super().__init__(*args, **kwargs)
             self.ui = QMainWindow()
             self.menus = None
+            self.menu_spec = []
+            self.menus_built = False
             self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
             self.progress_dialog = None
+            self.model_list_worker = None
+            self.export_worker = None
             self.simulation_dialog = None
             self.status_layout = None
             self.status_message = None
@@ -92,122 +291,78 @@ class MainWindow(FramelessWindow, QMainWindow):
             self.word_cloud_btn = None
             self.historical_stats_button = None
             self.stats_button = None
+            self.save_chat_button = None
+            self.view_saved_chats_button = None
+            self.simulation_btn = None
+            self.saved_chats_dialog = None
             self.stats_dialog = None
             self.assistant_response = ""
-            self.thread = None
+            self.response_task = None
             self.restart_button = None
             self.analytics_button = None
             self.stop_button = None
             self.download_button = None
             self.chat_display = None
+            self.chat_highlighter = None
+            self.stream_cursor = None
             self.model_combo = None
             self.input_field = None
             self.send_button = None
             self.word_cloud_dialog = None
+            # Word counts of the transcript, kept up to date as messages arrive
+            self._word_counter = Counter()
+            # The WordCloud that tokenizes each message for _word_counter, created on first use
+            self._word_processor = None
             self.historical_stats_dialog = None
             self.context_length_spinner = None
             self.selected_model = ""
-            self.messages = []
+            # A deque, so trimming the oldest messages does not shift the rest
+            self.messages = deque()
+            # Content of the last user message, kept at every user append
+            self._last_user_content = ""
+            # Estimated token count of the messages, kept at every append and trim
+            self._total_tokens = 0
+            # Message counts per role and the word count of the messages, for show_analytics
+            self._role_counts = Counter()
+            self._total_words = 0
+            # Word count of each message, in step with self.messages, so trimming can subtract
+            # a count instead of scanning the message again
+            self._message_words = deque()
             self.context_length = CONTEXT_LENGTH_DEFAULT
+            # Spinner steps are applied once the value settles, see update_context_length
+            self._pending_context_length = CONTEXT_LENGTH_DEFAULT
+            self._context_length_timer = QTimer(self)
+            self._context_length_timer.setSingleShot(True)
+            self._context_length_timer.setInterval(CONTEXT_LENGTH_DEBOUNCE_MS)
+            self._context_length_timer.timeout.connect(self.apply_context_length)
+            # Token context returned with the last response and the number of messages it covers
+            self._ctx = None
+            self._ctx_len = 0
+            # One client (and one HTTP connection pool) shared by every request, see get_client
+            self._client = None
+            # Responses, model listings and warm-ups run as tasks on the window's own pool, so
+            # its settings do not change the process-wide global pool
+            self._pool = QThreadPool(self)
+            self._pool.setMaxThreadCount(max(2, (os.cpu_count() or 2) // 2))
+            # Idle pool threads would otherwise exit after 30 s, i.e. between most chat turns,
+            # and every send would start a new OS thread again; they are released in closeEvent
+            self._pool.setExpiryTimeout(-1)
+            # Streamed chunks are buffered and drawn once per timer tick instead of once per token
+            self._chunk_buf = []
+            self._flush_timer = QTimer(self)
+            self._flush_timer.setInterval(STREAM_FLUSH_INTERVAL_MS)
+            self._flush_timer.timeout.connect(self.flush_chunks)
 
             ui_components = UIComponents(self)
             ui_components.init_ui()
 
             self.load_models()
 
-            # Initialize menus before creating MenuCreator
-            capabilities_instance = capabilities.Capabilities()
-            self.menus = {
-                "Analyze": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_analysis_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_analysis_types(),
-                        "Linguistic": capabilities_instance.get_prose_linguistic_analysis_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_analysis_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_analysis_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_analysis_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_analysis_types()
-                    },
-                    "Critical": capabilities_instance.get_critical_analysis_types(),
-                    "Psychoanalytical": capabilities_instance.get_psychoanalytical_analysis_types(),
-                    "Scientific": capabilities_instance.get_scientific_analysis_types(),
-                    "Philosophical": capabilities_instance.get_philosophical_analysis_types(),
-                    "Statistical": capabilities_instance.get_statistical_analysis_types(),
-                    "Opposition": capabilities_instance.get_opposition_analysis_types(),
-                    "Code": capabilities_instance.get_code_analysis_types(),
-                    "Prompt": capabilities_instance.get_prompt_analysis_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_analysis_types(),
-                    "Poetry": capabilities_instance.get_poetry_analysis_types(),
-                },
-                "Generate": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_generation_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_generation_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_generation_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_generation_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_generation_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_generation_types(),
-                    },
-                    "Documentation": capabilities_instance.get_documentation_generation_types(),
-                    "Prompt": capabilities_instance.get_prompt_generation_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_generation_types(),
-                    "Poetry": capabilities_instance.get_poetry_generation_types(),
-                    "Code": capabilities_instance.get_code_generation_types(),
-                },
-                "Transform": {
-                    "Prose": {
-                        "Textual": capabilities_instance.get_prose_textual_transformation_types(),
-                        "Semantic": capabilities_instance.get_prose_semantic_transformation_types(),
-                        "Cognitive": capabilities_instance.get_prose_cognitive_transformation_types(),
-                        "Contextual": capabilities_instance.get_prose_contextual_transformation_types(),
-                        "Stylistic": capabilities_instance.get_prose_stylistic_transformation_types(),
-                        "Narrative": capabilities_instance.get_prose_narrative_transformation_types(),
-                    },
-                    "Scaling": capabilities_instance.get_text_scaling_types(),
-                    "Enhancement": capabilities_instance.get_text_enhancement_types(),
-                    "Prompt": capabilities_instance.get_prompt_transformation_types(),
-                    "Art Prompt": capabilities_instance.get_art_prompt_transformation_types(),
-                    "Poetry": capabilities_instance.get_poetry_transformation_types(),
-                    "Code": capabilities_instance.get_code_transformation_types(),
-                },
-            }
-
-            menu_creator = MenuCreator(self)
-            menu_creator.create_menus()
-
             signal_connector = SignalConnector(self)
             signal_connector.connect_signals()
         except Exception as e:
             logger.error(f"{e}")
     
-    class ResponseThread(QThread):
-        response_chunk_received = pyqtSignal(str)
-        response_finished = pyqtSignal(str)
-        error_occurred = pyqtSignal(str)
-        
-        def __init__(self,
-                     model_name,
-                     messages):
-            super().__init__()
-            self.model_name = model_name
-            self.messages = messages.copy()
-        
-        def run(self):
-            response = ""
-            try:
-                prompt = messages_to_prompt(self.messages)
-                logger.debug(f"Prompt sent to Ollama:\n{prompt}")
-                for chunk in ollama.generate(model=self.model_name, prompt=prompt):
-                    # Since chunk is a string, we can use it directly
-                    logger.debug(f"Chunk received: {chunk}")
-                    content = chunk  # chunk is a string
-                    response += content
-                    self.response_chunk_received.emit(content)
-                self.response_finished.emit(response)
-            except Exception as e:
-                logger.error(f"Error in response thread: {e}")
-                self.error_occurred.emit(str(e))
-                
     def connect_signals(self):
         try:
             # ///////////////////////////////////////////////////////////////////
@@ -229,6 +384,73 @@ class MainWindow(FramelessWindow, QMainWindow):
         except Exception as e:
             logger.error(f"{e}")
 
+    def get_client(self):
+        """
+        Returns the shared Ollama client, creating it on first use.
+
+        The ollama package (and the HTTP stack it pulls in) is imported here rather than
+        at module level, so importing it is not part of the window's startup. Requests time
+        out after OLLAMA_CONNECT_TIMEOUT_S when the server cannot be reached and after
+        OLLAMA_READ_TIMEOUT_S without data, so no task blocks forever on a stalled server.
+
+        Returns:
+            ollama.Client: The client shared by every request.
+        """
+        if self._client is None:
+            import httpx
+            import ollama
+
+            timeout = httpx.Timeout(OLLAMA_READ_TIMEOUT_S, connect=OLLAMA_CONNECT_TIMEOUT_S)
+            self._client = ollama.Client(headers=OLLAMA_HEADERS, timeout=timeout)
+        return self._client
+
+    def showEvent(self, event):
+        """
+        Schedules the menu construction the first time the window is shown.
+
+        Creating a few hundred actions is left until after the first paint, so the
+        window appears before its menus are built.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super().showEvent(event)
+        if not self.menus_built:
+            self.menus_built = True
+            QTimer.singleShot(0, self.build_menus)
+
+    def closeEvent(self, event: QCloseEvent):
+        """
+        Cancels the running response and waits for the window's tasks before closing.
+
+        The pool's threads never expire, so they are only released here. Queued tasks that
+        have not started are dropped. The wait is bounded by POOL_SHUTDOWN_TIMEOUT_MS, since
+        a warm-up or model listing cannot be cancelled; such a task ends at the latest when
+        the client's timeout fails it.
+
+        Args:
+            event (QCloseEvent): The close event.
+        """
+        if self.response_task is not None:
+            self.response_task.cancel()
+        self._pool.clear()
+        if not self._pool.waitForDone(POOL_SHUTDOWN_TIMEOUT_MS):
+            logger.info("Closing with Ollama requests still running")
+        super().closeEvent(event)
+
+    def build_menus(self):
+        """
+        Creates the menu bar from the flattened menu spec.
+        """
+        try:
+            self.menus = _menus()
+            self.menu_spec = _menu_spec()
+
+            menu_creator = MenuCreator(self)
+            menu_creator.create_menus()
+        except Exception as e:
+            logger.error(f"{e}")
+
     def start_simulation(self):
         """
         Starts the simulation by creating and displaying a SimulationDialog.
@@ -241,56 +463,6 @@ class MainWindow(FramelessWindow, QMainWindow):
         )
         self.simulation_dialog.show()
         
-    def create_menus(self):
-        """
-        Creates a hierarchical menu structure in the application's menu bar.
-
-        The method iterates over the `self.menus` dictionary to dynamically
-        generate menus and submenus. Each menu item is connected to the 
-        `self.perform_ai_analysis` method, which is triggered when the menu 
-        item is selected.
-
-        The `self.menus` dictionary should have the following structure:
-        {
-            'Main Menu 1': {
-            'Submenu 1': ['Option 1', 'Option 2'],
-            'Submenu 2': {
-                'Subsubmenu 1': ['Option 3', 'Option 4']
-            }
-            },
-            'Main Menu 2': ['Option 5', 'Option 6']
-        }
-
-        The method supports nested submenus up to two levels deep.
-
-        Returns:
-            None
-        """
-        try:
-            for main_menu_name, main_submenus in self.menus.items():
-                main_menu = self.menuBar().addMenu(main_menu_name)
-                for submenu_name, submenus in main_submenus.items():
-                    if isinstance(submenus, dict):
-                        submenu = main_menu.addMenu(submenu_name)
-                        for subsubmenu_name, options in submenus.items():
-                            subsubmenu = submenu.addMenu(subsubmenu_name)
-                            for option in options:
-                                action = QAction(option, self)
-                                action.triggered.connect(
-                                    lambda checked, o=option: self.perform_ai_analysis(o)
-                                )
-                                subsubmenu.addAction(action)
-                    else:
-                        submenu = main_menu.addMenu(submenu_name)
-                        for option in submenus:
-                            action = QAction(option, self)
-                            action.triggered.connect(
-                                lambda checked, o=option: self.perform_ai_analysis(o)
-                            )
-                            submenu.addAction(action)
-        except Exception as e:
-            logger.error(f"{e}")
-            
     # /////////////////////////////////////////////////////////////////////////////////////
     # WORD CLOUD
     # /////////////////////////////////////////////////////////////////////////////////////
@@ -299,10 +471,13 @@ class MainWindow(FramelessWindow, QMainWindow):
         Opens the WordCloudDialog.
 
         This method initializes a WordCloudDialog with the current chat display
-        and shows the dialog to the user.
+        and shows the dialog to the user. The running word counts are passed along,
+        so the dialog does not have to tokenize the whole transcript again.
         """
         try:
-            self.word_cloud_dialog = WordCloudDialog(self.chat_display, self)
+            from QtOllama.ui.wordcloud_dialog import WordCloudDialog
+
+            self.word_cloud_dialog = WordCloudDialog(self.chat_display, self, word_counts=self._word_counter.copy())
             self.word_cloud_dialog.show()
         except Exception as e:
             logger.error(f"{e}")
@@ -317,6 +492,8 @@ class MainWindow(FramelessWindow, QMainWindow):
         This method initializes the HistoricalStatsDialog and shows it to the user.
         """
         try:
+            from QtOllama.ui.stats_dialog import HistoricalStatsDialog
+
             self.historical_stats_dialog = HistoricalStatsDialog(self)
             self.historical_stats_dialog.show()
     
@@ -328,27 +505,89 @@ class MainWindow(FramelessWindow, QMainWindow):
     # /////////////////////////////////////////////////////////////////////////////////////
     def load_models(self):
         """
-        Loads available models from the Ollama API and populates the model combo box.
-
-        This method retrieves a list of models from the Ollama API, extracts their names,
-        and adds them to the model combo box. If models are successfully loaded, the first
-        model is selected by default, and a signal is connected to handle model changes.
-        Logs the loaded model names or an error message if the loading fails.
+        Populates the model combo box from the model cache and schedules a refresh.
 
-        Raises:
-            Exception: If there is an error while loading models from the Ollama API.
+        The names saved by the last successful listing are shown immediately, so the
+        window does not wait on the Ollama server to start. The real listing runs on a
+        worker thread once the event loop is running, see refresh_models.
         """
         try:
-            models = ollama.list()["models"]
-            model_names = [model["name"] for model in models]
-            self.model_combo.addItems(model_names)
+            model_names = load_cached_models()
             if model_names:
-                self.selected_model = model_names[0]
-                self.model_combo.currentTextChanged.connect(self.model_changed)
-            logger.info(f"Loaded models: {model_names}")
+                self.update_model_list(model_names)
+                logger.info(f"Loaded cached models: {model_names}")
+            QTimer.singleShot(0, self.refresh_models)
         except Exception as e:
             logger.error(f"Error loading models: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load models: {str(e)}")
+
+    def refresh_models(self):
+        """
+        Lists the models from the Ollama API on a worker thread.
+
+        The result is delivered to handle_models_loaded, or to handle_models_error if
+        the server could not be reached.
+        """
+        self.model_list_worker = ModelListWorker(self.get_client())
+        self.model_list_worker.signals.models_loaded.connect(self.handle_models_loaded)
+        self.model_list_worker.signals.error_occurred.connect(self.handle_models_error)
+        self._pool.start(self.model_list_worker)
+
+    def handle_models_loaded(self, model_names):
+        """
+        Updates the model combo box and the model cache with a fresh listing.
+
+        Args:
+            model_names (list): The model names reported by the Ollama server.
+        """
+        self.update_model_list(model_names)
+        save_cached_models(model_names)
+        logger.info(f"Loaded models: {model_names}")
+
+    def handle_models_error(self, error_message):
+        """
+        Handles a failed model listing.
+
+        The cached model list stays usable, so the error is only shown in a message box
+        when there is nothing to choose from.
+
+        Args:
+            error_message (str): The error raised while listing the models.
+        """
+        logger.error(f"Error loading models: {error_message}")
+        if self.model_combo.count():
+            self.update_status(f"Failed to refresh models: {error_message}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to load models: {error_message}")
+
+    def update_model_list(self, model_names):
+        """
+        Synchronizes the model combo box with the given model names.
+
+        Only the difference is applied: models that disappeared are removed and new ones
+        are appended, so the current selection survives a refresh when the model still exists.
+        Signals and repaints are held back while the items change; model_changed is called
+        once afterwards if the selection moved.
+
+        Args:
+            model_names (list): The model names to show.
+        """
+        wanted = set(model_names)
+        self.model_combo.setUpdatesEnabled(False)
+        self.model_combo.blockSignals(True)
+        try:
+            for index in reversed(range(self.model_combo.count())):
+                if self.model_combo.itemText(index) not in wanted:
+                    self.model_combo.removeItem(index)
+            present = {self.model_combo.itemText(index) for index in range(self.model_combo.count())}
+            self.model_combo.addItems([name for name in model_names if name not in present])
+        finally:
+            self.model_combo.blockSignals(False)
+            self.model_combo.setUpdatesEnabled(True)
+            self.model_combo.update()
+
+        current_model = self.model_combo.currentText()
+        if current_model != self.selected_model:
+            self.model_changed(current_model)
 
     # /////////////////////////////////////////////////////////////////////////////////////
     # MODEL_CHANGED
@@ -363,7 +602,61 @@ class MainWindow(FramelessWindow, QMainWindow):
         text (str): The name of the newly selected model.
         """
         self.selected_model = text
+        self._ctx = None
         logger.info(f"Selected model changed to: {self.selected_model}")
+        if self.selected_model:
+            self.warm_model(self.selected_model)
+
+    def warm_model(self, model_name):
+        """
+        Loads the given model on the Ollama server in the background.
+
+        An empty prompt makes the server load the weights without generating anything,
+        and keep_alive keeps them resident, so the first real message does not pay
+        the model load time. It sends the same num_ctx and num_batch as ResponseRunnable.run,
+        since the server reloads a model that is asked for with different ones.
+
+        Parameters:
+        model_name (str): The name of the model to load.
+        """
+        client = self.get_client()
+        self.apply_context_length()
+        options = {"num_ctx": self.context_length, "num_batch": NUM_BATCH}
+
+        def warm():
+            try:
+                client.generate(model=model_name, prompt="", keep_alive=KEEP_ALIVE, options=options)
+                logger.info(f"Model loaded: {model_name}")
+            except Exception as e:
+                logger.error(f"Error loading model {model_name}: {e}")
+
+        self._pool.start(warm)
+
+    def update_context_length(self, value):
+        """
+        Updates the context length used for trimming and sent to Ollama as num_ctx.
+
+        The spinner reports every step, so the value is only recorded here and applied by
+        apply_context_length once it has been unchanged for CONTEXT_LENGTH_DEBOUNCE_MS.
+
+        Parameters:
+        value (int): The new context length.
+        """
+        self._pending_context_length = value
+        self._context_length_timer.start()
+
+    def apply_context_length(self):
+        """
+        Applies the context length last picked with the spinner, if it differs from the current one.
+
+        Called by the debounce timer, and before trimming or sending, so a value picked just
+        before a send is never missed.
+        """
+        self._context_length_timer.stop()
+        if self._pending_context_length == self.context_length:
+            return
+        self.context_length = self._pending_context_length
+        logger.info(f"Context length changed to: {self.context_length}")
     
     # /////////////////////////////////////////////////////////////////////////////////////
     # SEND_MESSAGE
@@ -374,41 +667,59 @@ class MainWindow(FramelessWindow, QMainWindow):
 
         This method retrieves the text from the input field, appends it to the messages list,
         displays the message in the chat display, and clears the input field. It then starts
-        a new thread to get the assistant's response and connects the thread's signals to the
-        appropriate handler methods.
+        a task on the thread pool to get the assistant's response, see start_response.
 
         Attributes:
             prompt (str): The text input from the user.
             messages (list): The list of messages exchanged in the chat.
-            assistant_response (str): The response from the assistant.
-            thread (ResponseThread): The thread responsible for fetching the assistant's response.
+            response_task (ResponseRunnable): The task responsible for fetching the assistant's response.
 
         Signals:
             response_chunk_received: Emitted when a chunk of the assistant's response is received.
             response_finished: Emitted when the assistant's response is fully received.
             error_occurred: Emitted when an error occurs during the response fetching process.
         """
+        if self.response_task is not None:
+            self.update_status("Please wait for the current response to finish.")
+            return
         prompt = self.input_field.text()
         if prompt:
-            self.messages.append({"role": "user", "content": prompt})
+            self.append_message("user", prompt)
             self.display_message("user", prompt)
             self.input_field.clear()
             logger.info(f"Sending message: {prompt}")
-            self.assistant_response = ""
-            self.chat_display.append("<b>Assistant:</b> ")
-            # Start a thread to get the assistant's response
-            self.thread = ResponseThread(self.selected_model, self.messages)
-            self.thread.response_chunk_received.connect(self.handle_response_chunk)
-            self.thread.response_finished.connect(self.handle_response_finished)
-            self.thread.error_occurred.connect(self.handle_error)
-            self.thread.start()
+            self.chat_display.appendPlainText("Assistant: ")
+            self.start_response()
+
+    def start_response(self):
+        """
+        Starts fetching the assistant's response to the current messages on the thread pool.
+
+        The task gets its own copy of the messages and reports back through its signals,
+        which are connected to the response handlers. When the context of the previous
+        response is still valid, only the messages added since are sent along with it, so
+        the server does not process the whole history again. Only one response runs at a
+        time, since every task streams into the same chunk buffer and stream cursor: sending
+        is disabled until the task finishes, fails or is cancelled by stop_chat.
+        """
+        self.apply_context_length()
+        if self._ctx is not None:
+            messages, context = islice(self.messages, self._ctx_len, None), self._ctx
+        else:
+            messages, context = self.messages, None
+        self.response_task = ResponseRunnable(self.selected_model, messages, self.get_client(), self.context_length, context)
+        self.response_task.signals.response_chunk_received.connect(self.handle_response_chunk)
+        self.response_task.signals.response_finished.connect(self.handle_response_finished)
+        self.response_task.signals.error_occurred.connect(self.handle_error)
+        self.send_button.setEnabled(False)
+        self._pool.start(self.response_task)
     
     def save_chat_to_history(self):
         try:
             chats_file = "./chat_history.json"
             
             # Get the current chat messages
-            chat = self.messages.copy()
+            chat = list(self.messages)
             
             # Add a timestamp
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -443,28 +754,71 @@ class MainWindow(FramelessWindow, QMainWindow):
         """
         Handles a chunk of response from the assistant.
 
-        This method appends the given chunk to the assistant's response,
-        updates the chat display with the new chunk, and ensures that the
-        cursor is visible in the chat display.
+        This method adds the given chunk to the pending display buffer. The chat display
+        itself is only updated by flush_chunks, so a fast model costs one layout per timer
+        tick rather than one per token. The full response is assembled by the task and
+        arrives with response_finished.
 
         Args:
             chunk (str): A piece of the response from the assistant.
         """
-        self.assistant_response += chunk
-        self.chat_display.insertPlainText(chunk)
-        self.chat_display.ensureCursorVisible()
+        self._chunk_buf.append(chunk)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush_chunks(self):
+        """
+        Writes the buffered response chunks to the end of the chat display in one insert.
+
+        The text goes through the stream cursor kept on the window, so no cursor is copied
+        out of and back into the chat display. The view only follows the new text if it was
+        already at the bottom, so a user who scrolled up to read is left where they are.
+        The timer is stopped once there is nothing left to write, and restarted by the
+        next chunk.
+        """
+        if not self._chunk_buf:
+            self._flush_timer.stop()
+            return
+        text = "".join(self._chunk_buf)
+        self._chunk_buf.clear()
+        scroll_bar = self.chat_display.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
+        self.stream_cursor.movePosition(QTextCursor.MoveOperation.End)
+        self.stream_cursor.insertText(text)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
     
-    def handle_response_finished(self):
+    def handle_response_finished(self, response="", context=None):
         """
         Handles the completion of a response from the assistant.
 
-        This method appends the assistant's response to the messages list with the role 
-        set to "assistant" and logs that the response has finished.
+        This method writes any chunks still waiting for the flush timer, appends the
+        response joined by the task to the messages list with the role set to "assistant"
+        and logs that the response has finished. The token context returned by the server is kept for the next request.
+        Only the current task is handled, so a response the user no longer waits for never
+        sets the context, and only while the model it was sent to is still selected.
+
+        Args:
+            response (str): The full response, as assembled by the task.
+            context (list): The token context returned with the response.
 
         Attributes:
             self.assistant_response (str): The response content from the assistant.
         """
-        self.messages.append({"role": "assistant", "content": self.assistant_response})
+        task = self.response_task
+        if task is None or self.sender() is not task.signals:
+            return
+        self.response_task = None
+        self.send_button.setEnabled(True)
+        self.flush_chunks()
+        self._flush_timer.stop()
+        self.assistant_response = response
+        self.count_words(self.assistant_response)
+        self.append_message("assistant", self.assistant_response)
+        # A context is only valid for the model that produced it; the model may have been
+        # switched while the response streamed
+        self._ctx = (context or None) if task.model_name == self.selected_model else None
+        self._ctx_len = len(self.messages)
         logger.info("Response finished")
     
     def handle_error(self, error_message):
@@ -474,12 +828,17 @@ class MainWindow(FramelessWindow, QMainWindow):
         Args:
             error_message (str): The error message to be logged and displayed.
         """
+        if self.response_task is not None and self.sender() is self.response_task.signals:
+            self.response_task = None
+            self.send_button.setEnabled(True)
         logger.error(f"Error in response thread: {error_message}")
         QMessageBox.critical(self, "Error", f"An error occurred: {error_message}")
     
     def display_message(self, role, content):
         """
-        Appends a formatted message to the chat display based on the role.
+        Appends a message to the chat display, prefixed with its role.
+
+        The prefix is bolded by the ChatHighlighter on the chat display's document.
 
         Parameters:
         role (str): The role of the message sender, either "user" or "assistant".
@@ -489,10 +848,30 @@ class MainWindow(FramelessWindow, QMainWindow):
         None
         """
         if role == "user":
-            self.chat_display.append(f"<b>User:</b> {content}")
+            self.chat_display.appendPlainText(f"User: {content}")
         else:
-            self.chat_display.append(f"<b>Assistant:</b> {content}")
-    
+            self.chat_display.appendPlainText(f"Assistant: {content}")
+        self.count_words(content)
+
+    def count_words(self, text):
+        """
+        Adds the words of a message to the running word counts used by the word cloud.
+
+        The message goes through WordCloud.process_text, so the counts are tokenized,
+        stopword-filtered and collocated exactly as WordCloud.generate would do it. Case
+        and plurals are folded across messages by the dialog.
+
+        Parameters:
+        text (str): The message text.
+        """
+        if self._word_processor is None:
+            try:
+                from wordcloud import WordCloud
+            except ImportError:
+                return
+            self._word_processor = WordCloud()
+        self._word_counter.update(self._word_processor.process_text(text))
+
     def download_chat(self):
         """
         Prompts the user to save the chat messages to a file in various formats (PDF, TXT, MD, HTML).
@@ -505,12 +884,13 @@ class MainWindow(FramelessWindow, QMainWindow):
         - MD: Saves the chat as a markdown file.
         - HTML: Saves the chat as an HTML file.
         The method uses QFileDialog to prompt the user for the save location and file name.
-        Raises:
-            IOError: If there is an error writing to the file.
+        PDF output is printed by a PdfExportWorker from a clone of the chat document, so the
+        live document is never touched off the GUI thread. The highlighter's bold prefixes
+        live in the layout rather than the document, so the clone is highlighted again
+        before it is handed over. The other formats are converted and
+        written by a ChatExportWorker. Both run on the thread pool and report to
+        handle_export_finished or handle_export_error.
         """
-        markdown_content = "\n\n".join(
-            [f"**{msg['role']}**: {msg['content']}" for msg in self.messages]
-        )
         options = "PDF Files (*.pdf);;Text Files (*.txt);;Markdown Files (*.md);;HTML Files (*.html)"
         filename, _ = QFileDialog.getSaveFileName(None, "Save File", "", options)
         
@@ -522,17 +902,35 @@ class MainWindow(FramelessWindow, QMainWindow):
                 file_extension = "txt"
             
             if file_extension == "pdf":
-                printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-                printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-                printer.setOutputFileName(filename)
-                self.chat_display.document().print(printer)
-            elif file_extension in ["txt", "md"]:
-                with open(filename, 'w', encoding='utf-8') as file:
-                    file.write(markdown_content)
-            elif file_extension == "html":
-                with open(filename, 'w', encoding='utf-8') as file:
-                    html_content = markdown.markdown(markdown_content)
-                    file.write(html_content)
+                document = self.chat_display.document().clone()
+                # Owned by the clone; print() carries its formats over to the pages
+                ChatHighlighter(document).rehighlight()
+                self.export_worker = PdfExportWorker(document, filename)
+            else:
+                self.export_worker = ChatExportWorker(self.messages, filename, file_extension)
+            self.export_worker.signals.finished.connect(self.handle_export_finished)
+            self.export_worker.signals.error_occurred.connect(self.handle_export_error)
+            self._pool.start(self.export_worker)
+
+    def handle_export_finished(self, filename):
+        """
+        Reports a finished chat export in the status bar.
+
+        Args:
+            filename (str): The file the chat was written to.
+        """
+        self.update_status(f"Chat saved to {filename}")
+        logger.info(f"Chat saved to {filename}")
+
+    def handle_export_error(self, error_message):
+        """
+        Handles a failed chat export.
+
+        Args:
+            error_message (str): The error raised while writing the file.
+        """
+        logger.error(f"Error saving chat: {error_message}")
+        QMessageBox.critical(self, "Error", f"Failed to save chat: {error_message}")
 
     def show_statistics(self):
         """
@@ -550,13 +948,15 @@ class MainWindow(FramelessWindow, QMainWindow):
             self.stats_dialog.close()
             self.stats_dialog = None
         else:
+            from QtOllama.utility.stats import StatsDialog
+
             self.stats_dialog = StatsDialog(self.chat_display, self)
             self.stats_dialog.show()
     
     def update_info(self):
         """
         Updates the information label with various text statistics and interpretations.
-        This method retrieves the text from the text editor, analyzes it using TextBlob and textstat,
+        This method retrieves the text from the chat display, analyzes it using TextBlob and textstat,
         and updates the info label with the following information:
         - Number of characters
         - Number of words
@@ -568,7 +968,10 @@ class MainWindow(FramelessWindow, QMainWindow):
         Returns:
             None
         """
-        text = self.text_editor.toPlainText()
+        from textblob import TextBlob
+        from textstat import textstat
+
+        text = self.chat_display.toPlainText()
         blob = TextBlob(text)
         
         sentiment_polarity = blob.sentiment.polarity
@@ -612,6 +1015,10 @@ class MainWindow(FramelessWindow, QMainWindow):
             None
         """
 
+        if self.response_task is not None:
+            self.update_status("Please wait for the current response to finish.")
+            return
+
         # Check if there is selected text in the chat_display
         text_cursor = self.chat_display.textCursor()
         if text_cursor.hasSelection():
@@ -627,59 +1034,85 @@ class MainWindow(FramelessWindow, QMainWindow):
         prompt = f"Please perform {analysis_type} on the following text: '{text}'"
         
         # Add the message to the messages list
-        self.messages.append({"role": "user", "content": prompt})
+        self.append_message("user", prompt)
         self.display_message("user", prompt)
-        self.assistant_response = ""
-        self.chat_display.append("<b>Assistant:</b> ")
+        self.chat_display.appendPlainText("Assistant: ")
         
         # Trim messages to fit within context length
         self.trim_messages()
         
-        # Start a thread to get the assistant's response
-        self.thread = ResponseThread(self.selected_model, self.messages)
-        self.thread.response_chunk_received.connect(self.handle_response_chunk)
-        self.thread.response_finished.connect(self.handle_response_finished)
-        self.thread.error_occurred.connect(self.handle_error)
-        self.thread.start()
+        # Start a task to get the assistant's response
+        self.start_response()
     
-    def trim_messages(self):
+    def append_message(self, role, content):
         """
-        Trims the list of messages to ensure the total length of their content does not exceed the context length.
+        Appends a message to the messages list and updates the totals kept alongside it.
 
-        This method iterates through the messages and removes the oldest messages until the total length of the 
-        remaining messages' content is within the specified context length. It ensures that at least one message 
-        remains in the list.
+        Every message is added through here, so the estimated token count used by
+        trim_messages, the counts shown by show_analytics and the last user message never
+        need a scan of the messages.
+
+        Args:
+            role (str): The role of the message sender, either "user" or "assistant".
+            content (str): The content of the message.
+        """
+        self.messages.append({"role": role, "content": content})
+        self._total_tokens += estimate_tokens(content)
+        self._role_counts[role] += 1
+        words = _word_count(content)
+        self._message_words.append(words)
+        self._total_words += words
+        if role == "user":
+            self._last_user_content = content
+    
+    def trim_messages(self):
+        """
+        Trims the list of messages to ensure their estimated token count does not exceed the context length.
+
+        Nothing is removed while the estimated token count of the messages is within the specified
+        context length, which is also the num_ctx the model runs with. Once it is exceeded, the oldest
+        messages after the first one are removed until the count is down to TRIM_LOW_WATERMARK of the
+        context length. Trimming in one larger step instead of a message per turn keeps the start of
+        the prompt unchanged for many turns, so the server can reuse its cache of it, and keeping the
+        first message keeps the opening of the chat. Tokens are estimated from the content length,
+        see estimate_tokens. It ensures that the first and the latest message remain in the list.
+        Removing messages drops the saved token context, which still contains them.
+        The total is kept up to date by append_message and here, so a trim only
+        touches the messages it removes.
 
         Attributes:
-            self.messages (list): A list of message dictionaries, where each dictionary contains a "content" key 
+            self.messages (deque): A deque of message dictionaries, where each dictionary contains a "content" key 
                                   with the message text.
-            self.context_length (int): The maximum allowed total length of the messages' content.
+            self.context_length (int): The maximum allowed estimated token count of the messages.
 
         Logs:
             Logs an info message indicating the number of messages remaining after trimming.
         """
-        total_length = sum(len(msg["content"]) for msg in self.messages)
-        while total_length > self.context_length and len(self.messages) > 1:
-            removed_message = self.messages.pop(0)
-            total_length -= len(removed_message["content"])
+        self.apply_context_length()
+        if self._total_tokens <= self.context_length:
+            return
+        low_watermark = int(self.context_length * TRIM_LOW_WATERMARK)
+        while self._total_tokens > low_watermark and len(self.messages) > 2:
+            removed_message = self.messages[1]
+            del self.messages[1]
+            self._total_tokens -= estimate_tokens(removed_message["content"])
+            self._role_counts[removed_message["role"]] -= 1
+            self._total_words -= self._message_words[1]
+            del self._message_words[1]
+            self._ctx = None
         logger.info(f"Trimmed messages to fit context length. Current message count: {len(self.messages)}")
         
     def get_last_user_message(self):
         """
         Retrieve the content of the last message sent by the user.
 
-        This method iterates through the list of messages in reverse order and 
-        returns the content of the first message found that has the role 'user'. 
-        If no such message is found, it returns an empty string.
+        The content is recorded whenever a user message is appended, so the messages do not
+        have to be scanned. It is reset when the chat is stopped.
 
         Returns:
-            str: The content of the last user message, or an empty string if no user message is found.
+            str: The content of the last user message, or an empty string if no user message was sent.
         """
-
-        for msg in reversed(self.messages):
-            if msg['role'] == 'user':
-                return msg['content']
-        return ""
+        return self._last_user_content
     
     def get_active_window(self):
         """
@@ -756,16 +1189,19 @@ class MainWindow(FramelessWindow, QMainWindow):
         - Estimated total tokens: The total number of words in all messages.
         - Current context length: The current length of the context.
 
+        The counts are kept up to date by append_message and trim_messages, so showing them
+        does not scan the messages. Tokens are counted the same way as in update_info.
+
         A log entry is created to indicate that the analytics have been displayed.
         """
-        user_messages = [msg['content'] for msg in self.messages if msg['role'] == 'user']
-        assistant_messages = [msg['content'] for msg in self.messages if msg['role'] == 'assistant']
         total_messages = len(self.messages)
-        total_tokens = sum(len(msg['content'].split()) for msg in self.messages)
+        user_messages = self._role_counts['user']
+        assistant_messages = self._role_counts['assistant']
+        total_tokens = self._total_words
         message = f"""
             Total messages: {total_messages}\n
-            User messages: {len(user_messages)}\n
-            Assistant messages: {len(assistant_messages)}\n
+            User messages: {user_messages}\n
+            Assistant messages: {assistant_messages}\n
             Estimated total tokens: {total_tokens}\n
             Current context length: {self.context_length}
             """
@@ -774,20 +1210,32 @@ class MainWindow(FramelessWindow, QMainWindow):
     
     def stop_chat(self):
         """
-        Stops the chat by terminating the running thread, clearing messages, and updating the chat display.
+        Stops the chat by detaching the running response task, clearing messages, and updating the chat display.
 
         This method performs the following actions:
-        1. Checks if a thread is running and terminates it.
-        2. Waits for the thread to finish.
-        3. Clears the list of messages.
-        4. Clears the chat display.
-        5. Logs the action of stopping and clearing the chat.
-        """
-        if self.thread and self.thread.isRunning():
-            self.thread.terminate()
-            self.thread.wait()
-        self.messages = []
+        1. Cancels the current response task, which closes its stream at the next chunk, and
+           disconnects its signals, so whatever it still produces is dropped. Nothing waits
+           for the task, so stopping never blocks the GUI.
+        2. Clears the list of messages.
+        3. Clears the chat display.
+        4. Logs the action of stopping and clearing the chat.
+        """
+        if self.response_task is not None:
+            self.response_task.cancel()
+            self.response_task.signals.disconnect()
+            self.response_task = None
+            self.send_button.setEnabled(True)
+        self._flush_timer.stop()
+        self._chunk_buf.clear()
+        self.messages = deque()
+        self._last_user_content = ""
+        self._total_tokens = 0
+        self._role_counts.clear()
+        self._total_words = 0
+        self._message_words.clear()
+        self._ctx = None
         self.chat_display.clear()
+        self._word_counter.clear()
         print("Chat stopped and cleared")
         logger.info("Chat stopped and cleared")
     
@@ -803,35 +1251,205 @@ class MainWindow(FramelessWindow, QMainWindow):
         logger.info("Chat restarted")
 
 
-class ResponseThread(QThread):
+class ModelListSignals(QObject):
+    """
+    Signals emitted by ModelListWorker.
+
+    Attributes:
+        models_loaded (pyqtSignal): Signal emitted with the list of model names.
+        error_occurred (pyqtSignal): Signal emitted when the models could not be listed.
+    """
+    models_loaded = pyqtSignal(list)
+    error_occurred = pyqtSignal(str)
+
+
+class ModelListWorker(QRunnable):
+    """
+    ModelListWorker is a QRunnable that lists the models of the Ollama server off the GUI thread.
+
+    Attributes:
+        client (ollama.Client): The shared client used to talk to the Ollama server.
+        signals (ModelListSignals): The signals used to report the result.
+    """
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.signals = ModelListSignals()
+
+    def run(self):
+        """
+        Lists the models and emits their names, or the error if the request fails.
+
+        Older ollama clients return plain dicts keyed by "name", newer ones return models
+        whose name is in the `model` field.
+        """
+        try:
+            models = self.client.list().get("models", ())
+            if models and isinstance(models[0], dict):
+                model_names = list(map(_get_name, models))
+            else:
+                model_names = [model.model for model in models]
+            self.signals.models_loaded.emit(model_names)
+        except Exception as e:
+            logger.error(f"Error listing models: {e}", exc_info=True)
+            self.signals.error_occurred.emit(str(e))
+
+
+class ChatExportSignals(QObject):
+    """
+    Signals emitted by ChatExportWorker.
+
+    Attributes:
+        finished (pyqtSignal): Signal emitted with the file name once the chat is written.
+        error_occurred (pyqtSignal): Signal emitted when the chat could not be written.
+    """
+    finished = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+
+
+class ChatExportWorker(QRunnable):
+    """
+    ChatExportWorker is a QRunnable that converts the chat to markdown or HTML and writes it
+    to a file off the GUI thread.
+
+    Attributes:
+        messages (list): A copy of the messages to export.
+        filename (str): The file to write.
+        file_extension (str): The output format, "txt", "md" or "html".
+        signals (ChatExportSignals): The signals used to report the result.
+    """
+    def __init__(self, messages, filename, file_extension):
+        super().__init__()
+        self.messages = messages.copy()
+        self.filename = filename
+        self.file_extension = file_extension
+        self.signals = ChatExportSignals()
+
+    def run(self):
+        """
+        Writes the export through a file with a 1 MiB buffer, then emits the file name, or the
+        error if the conversion or the write fails. Markdown and text are streamed to the file
+        with writelines, so the whole chat is never built as one string; HTML needs the full
+        markdown for the conversion and is written in one call. The file is written next to
+        the target and swapped in with os.replace, so a failed export never leaves a
+        truncated file in place of an earlier one; the temporary file is removed when the
+        export fails.
+        """
+        tmp_path = f"{self.filename}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as file:
+                if self.file_extension == "html":
+                    file.write(markdown_to_html(messages_to_markdown(self.messages)))
+                else:
+                    file.writelines(iter_markdown(self.messages))
+            os.replace(tmp_path, self.filename)
+            self.signals.finished.emit(self.filename)
+        except Exception as e:
+            logger.error(f"Error exporting chat: {e}", exc_info=True)
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            self.signals.error_occurred.emit(str(e))
+
+
+class PdfExportWorker(QRunnable):
     """
+    PdfExportWorker is a QRunnable that prints a chat document to a PDF file off the GUI thread.
+
+    QPainter supports painting on a QPrinter outside the GUI thread. The worker is given a
+    clone of the chat document, since QTextDocument is not reentrant and the live one keeps
+    changing while the chat streams.
+
+    Attributes:
+        document (QTextDocument): The cloned chat document to print.
+        filename (str): The PDF file to write.
+        signals (ChatExportSignals): The signals used to report the result.
+    """
+    def __init__(self, document, filename):
+        super().__init__()
+        self.document = document
+        self.filename = filename
+        self.signals = ChatExportSignals()
+
+    def run(self):
+        """
+        Prints the document to the PDF file and emits the file name, or the error if printing fails.
+        """
+        try:
+            from PyQt6.QtPrintSupport import QPrinter
+
+            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+            printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
+            printer.setOutputFileName(self.filename)
+            self.document.print(printer)
+            self.signals.finished.emit(self.filename)
+        except Exception as e:
+            logger.error(f"Error exporting chat to PDF: {e}", exc_info=True)
+            self.signals.error_occurred.emit(str(e))
+
+
+class ResponseSignals(QObject):
+    """
+    Signals emitted by ResponseRunnable.
+
     Attributes:
         response_chunk_received (pyqtSignal): Signal emitted when a chunk of the response is received.
-        response_finished (pyqtSignal): Signal emitted when the entire response is finished.
+        response_finished (pyqtSignal): Signal emitted with the entire response and its token context.
         error_occurred (pyqtSignal): Signal emitted when an error occurs during the response generation.
+    """
+    response_chunk_received = pyqtSignal(str)
+    response_finished = pyqtSignal(str, list)
+    error_occurred = pyqtSignal(str)
+
+
+class ResponseRunnable(QRunnable):
+    """
+    Attributes:
+        signals (ResponseSignals): The signals used to report the response.
         model_name (str): The name of the model to use for generating responses.
-        messages (list): A list of messages to send to the model.
+        messages (tuple): A snapshot of the messages to send to the model.
+        client (ollama.Client): The shared client used to talk to the Ollama server.
+        context_length (int): The context window size requested from the server (num_ctx).
+        context (list): The token context of the previous response, or None to start fresh.
+        cancel_event (threading.Event): Set by cancel(); checked for every chunk of the stream.
     Methods:
         run():
-            Executes the thread, generating responses from the model and emitting signals for each chunk received and when the response is finished.
-    ResponseThread is a QThread subclass that handles generating responses using a specified model and emits signals during the process.
+            Generates the response from the model on a pool thread, emitting signals for each chunk received and when the response is finished.
+        cancel():
+            Asks the task to stop reading the stream.
+    ResponseRunnable is a QRunnable that generates a response using a specified model on the main window's
+    thread pool, so sending a message does not start a new OS thread.
     """
-    response_chunk_received = pyqtSignal(str)
-    response_finished = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
-    
-    def __init__(self, model_name, messages):
+    def __init__(self, model_name, messages, client, context_length=CONTEXT_LENGTH_DEFAULT, context=None):
         """
         Initializes the instance of the class.
 
         Args:
             model_name (str): The name of the model.
-            messages (list): A list of messages to be copied.
+            messages (list): The messages to send, kept as a tuple snapshot so the GUI thread
+                can go on appending to its list while the task reads. With a context, only the
+                messages added since the previous response.
+            client (ollama.Client): The shared client, reused so requests keep one connection pool.
+            context_length (int): The context window size requested from the server.
+            context (list): The token context of the previous response.
 
         """
         super().__init__()
+        self.signals = ResponseSignals()
         self.model_name = model_name
-        self.messages = messages.copy()
+        self.messages = tuple(messages)
+        self.client = client
+        self.context_length = context_length
+        self.context = context
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """
+        Asks the task to stop. The stream is closed when the next chunk arrives, which hands
+        its connection back to the client's pool instead of leaving it half read.
+        """
+        self.cancel_event.set()
     
     def run(self):
         """
@@ -839,66 +1457,83 @@ class ResponseThread(QThread):
 
         This method constructs a prompt from the provided messages, sends it to the Ollama model,
         and processes the streamed response chunks. Each chunk is either appended to the final
-        response or handled as an error if it cannot be parsed. The method emits signals for
-        each received chunk and the final response, as well as any errors encountered.
+        response or handled as an error if it cannot be parsed. Chunks are batched and signalled
+        once STREAM_BATCH_CHARS characters or STREAM_FLUSH_INTERVAL_MS have accumulated, so the
+        GUI thread handles one event per batch rather than one per token. The method emits
+        signals for each batch and the final response, as well as any errors encountered.
 
         Emits:
-            response_chunk_received (str): Signal emitted for each chunk of the response received.
-            response_finished (str): Signal emitted when the entire response has been received.
+            response_chunk_received (str): Signal emitted for each batch of response chunks received.
+            response_finished (str, list): Signal emitted with the entire response and the token context
+                from the final chunk once the response has been received.
             error_occurred (str): Signal emitted if an error occurs during the response generation.
 
         Raises:
             Exception: If any error occurs during the response generation process.
         """
-        response = ""
+        # Collected and joined once; += would copy the growing response for every chunk
+        parts = []
+        context = []
+        batch = []
+        batch_len = 0
+        batch_interval = STREAM_FLUSH_INTERVAL_MS / 1000
+        batch_start = monotonic()
         try:
             prompt = messages_to_prompt(self.messages)
             logger.debug(f"Prompt sent to Ollama:\n{prompt}")
-            for chunk in ollama.generate(model=self.model_name, prompt=prompt, stream=True):
-                logger.debug(f"Type of chunk: {type(chunk)}")
-                logger.debug(f"Chunk received: {chunk}")
+            # Keep the model loaded and always request the same num_ctx: a different
+            # num_ctx or an expired keep_alive makes the server reload the model.
+            stream = self.client.generate(
+                model=self.model_name,
+                prompt=prompt,
+                stream=True,
+                keep_alive=KEEP_ALIVE,
+                options={"num_ctx": self.context_length, "num_batch": NUM_BATCH},
+                context=self.context,
+            )
+            # Bound once, since the loop runs for every token
+            is_cancelled = self.cancel_event.is_set
+            emit_batch = self.signals.response_chunk_received.emit
+            add_part = parts.append
+            add_to_batch = batch.append
+            # The f-strings below format every chunk, so they are only built when they are logged
+            log_chunks = logger.isEnabledFor(logging.DEBUG)
+            for chunk in stream:
+                if is_cancelled():
+                    stream.close()
+                    logger.info("Response cancelled")
+                    return
+                if log_chunks:
+                    logger.debug(f"Type of chunk: {type(chunk)}")
+                    logger.debug(f"Chunk received: {chunk}")
                 # Handle chunk
                 if isinstance(chunk, str):
                     try:
                         chunk_dict = json.loads(chunk)
                         content = chunk_dict.get('response', '')
+                        context = chunk_dict.get('context', context)
                     except json.JSONDecodeError:
                         logger.error(f"Failed to parse chunk as JSON: {chunk}")
                         content = chunk  # Use as is
-                elif isinstance(chunk, dict):
-                    content = chunk.get('response', '')
+                elif hasattr(chunk, 'get'):
+                    # Older ollama clients yield dicts, newer ones response objects with the same
+                    # keys; their optional fields are None until the final chunk
+                    content = chunk.get('response') or ''
+                    context = chunk.get('context') or context
                 else:
                     logger.error(f"Unexpected chunk type: {type(chunk)}")
                     content = ''
-                response += content
-                self.response_chunk_received.emit(content)
-            self.response_finished.emit(response)
+                add_part(content)
+                add_to_batch(content)
+                batch_len += len(content)
+                if batch_len >= STREAM_BATCH_CHARS or monotonic() - batch_start > batch_interval:
+                    emit_batch("".join(batch))
+                    batch.clear()
+                    batch_len = 0
+                    batch_start = monotonic()
+            if batch:
+                self.signals.response_chunk_received.emit("".join(batch))
+            self.signals.response_finished.emit("".join(parts), context or [])
         except Exception as e:
             logger.error(f"Error in response thread: {e}", exc_info=True)
-            self.error_occurred.emit(str(e))
-            
-
-    def ollama_generator(model_name: str, messages: Dict) -> Generator:
-        """
-        Generates a stream of messages from the Ollama chat model.
-    
-        Args:
-            model_name (str): The name of the chat model to use.
-            messages (Dict): A dictionary containing the messages to send to the model.
-    
-        Yields:
-            str: The content of each message chunk from the stream.
-    
-        Raises:
-            Exception: If an error occurs during the generation process, it logs the error and raises the exception.
-        """
-        try:
-            stream = ollama.chat(
-                model=model_name, messages=messages, stream=True
-            )
-            for chunk in stream:
-                yield chunk['message']['content']
-        except Exception as e:
-            logger.error(f"Error in ollama_generator: {str(e)}", exc_info=True)
-            raise
-    
+            self.signals.error_occurred.emit(str(e))
@@ -0,0 +1,38 @@
+# chat_highlighter.py
+import re
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+ROLE_PREFIX_RE = re.compile(r"^(User|Assistant): ")
+
+
+class ChatHighlighter(QSyntaxHighlighter):
+    """
+    Bolds the role prefix of each message in the plain-text chat transcript.
+
+    The transcript is a QPlainTextEdit, so the "User:" / "Assistant:" prefixes that used
+    to be written as <b> markup are styled here instead.
+    """
+
+    def __init__(self, document):
+        """
+        Initializes the highlighter on the given document.
+
+        Args:
+            document (QTextDocument): The chat transcript document.
+        """
+        super().__init__(document)
+        self.role_format = QTextCharFormat()
+        self.role_format.setFontWeight(QFont.Weight.Bold)
+
+    def highlightBlock(self, text):
+        """
+        Bolds the role prefix if the block starts a message.
+
+        Args:
+            text (str): The text of the current block.
+        """
+        match = ROLE_PREFIX_RE.match(text)
+        if match:
+            self.setFormat(0, match.end(1) + 1, self.role_format)
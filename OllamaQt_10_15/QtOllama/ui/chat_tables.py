@@ -62,7 +62,8 @@ class SavedChatsDialog(QDialog):
         If the file does not exist, it updates the label to indicate that no chats are available.
         If the file exists, it reads the chat data and populates the table with the chat entries.
         Each chat entry includes a timestamp and the chat content, which is formatted and displayed
-        in the table.
+        in the table. All rows are allocated with one setRowCount, and updates, sorting and signals
+        are held back until every cell is set.
         Raises:
             Exception: If there is an error loading the chat history, it logs the error message.
         """
@@ -78,18 +79,26 @@ class SavedChatsDialog(QDialog):
                 logger.info(f"Loaded {len(saved_chats)} chat entries from {chats_file}.")
             
             # Populate the table with the saved chats
-            for entry in saved_chats:
-                timestamp = entry.get("timestamp", "Unknown Time")
-                chat = entry.get("chat", [])
-                chat_content = ""
-                for msg in chat:
-                    role = msg.get("role", "")
-                    content = msg.get("content", "")
-                    chat_content += f"{role.capitalize()}: {content}\n"
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                self.table.setItem(row, 0, QTableWidgetItem(timestamp))
-                self.table.setItem(row, 1, QTableWidgetItem(chat_content))
+            sorting_enabled = self.table.isSortingEnabled()
+            self.table.setUpdatesEnabled(False)
+            self.table.setSortingEnabled(False)
+            self.table.blockSignals(True)
+            try:
+                self.table.setRowCount(len(saved_chats))
+                for row, entry in enumerate(saved_chats):
+                    timestamp = entry.get("timestamp", "Unknown Time")
+                    chat = entry.get("chat", [])
+                    chat_content = ""
+                    for msg in chat:
+                        role = msg.get("role", "")
+                        content = msg.get("content", "")
+                        chat_content += f"{role.capitalize()}: {content}\n"
+                    self.table.setItem(row, 0, QTableWidgetItem(timestamp))
+                    self.table.setItem(row, 1, QTableWidgetItem(chat_content))
+            finally:
+                self.table.blockSignals(False)
+                self.table.setSortingEnabled(sorting_enabled)
+                self.table.setUpdatesEnabled(True)
             logger.info("Successfully populated the table with chat entries.")
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error while loading chats: {e}")
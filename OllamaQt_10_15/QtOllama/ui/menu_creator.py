@@ -1,10 +1,64 @@
 # menu_creator.py
+from collections.abc import Mapping
 from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import QMenu
 from QtOllama.utility.logger_setup import create_logger
 
 logger = create_logger(__name__)
 
+# Kinds of entries yielded by walk_menus
+SUBMENU, LEAF = 0, 1
+
+
+def walk_menus(menus, path=()):
+    """
+    Flattens a nested menu dictionary into (path, kind, payload) triples.
+
+    Every menu is yielded before its entries, so a menu always exists by the time
+    something is added to it.
+
+    Args:
+        menus (Mapping): Menu names mapped to either a nested mapping or a sequence of options.
+        path (tuple): The menu names leading to `menus`.
+
+    Yields:
+        tuple: The path of the parent menu, e.g. ("Analyze", "Prose"), the kind of entry
+            (SUBMENU or LEAF) and the name of the submenu or option.
+    """
+    for name, children in menus.items():
+        yield path, SUBMENU, name
+        if isinstance(children, Mapping):
+            yield from walk_menus(children, path + (name,))
+        else:
+            for option in children:
+                yield path + (name,), LEAF, option
+
+
+class AIAction(QAction):
+    """
+    A menu action that runs one AI analysis option when triggered.
+
+    The option is stored on the action and the slot is a bound method, so no closure or
+    partial is kept per action, and the `checked` argument of `triggered` is simply ignored.
+
+    Attributes:
+        option (str): The analysis option passed to the slot.
+        slot (callable): The callable that performs the analysis, e.g. `perform_ai_analysis`.
+    """
+
+    def __init__(self, option, slot, parent):
+        super().__init__(option, parent)
+        self.option = option
+        self.slot = slot
+        self.triggered.connect(self.fire)
+
+    def fire(self):
+        """
+        Calls the slot with the stored option.
+        """
+        self.slot(self.option)
+
+
 class MenuCreator:
     """
     A class to create and manage menus for the main window.
@@ -28,9 +82,10 @@ class MenuCreator:
         """
         Creates the menu structure for the main window.
 
-        This method iterates through the `menus` dictionary of the main window,
-        creating the main menus, submenus, and actions dynamically. The structure
-        of the `menus` dictionary should be as follows:
+        This method iterates through the flat `menu_spec` of the main window, built
+        from its `menus` dictionary by `walk_menus`, and creates the main menus,
+        submenus, and actions dynamically. Each entry is added to its parent menu,
+        looked up by path, and dispatched on its kind. The structure of the `menus` dictionary should be as follows:
         
         {
             "Main Menu Name": {
@@ -43,8 +98,8 @@ class MenuCreator:
             ...
         }
 
-        Each option in the submenus and subsubmenus is connected to the 
-        `perform_ai_analysis` method of the main window.
+        Each option in the submenus and subsubmenus is an `AIAction` that calls the
+        `perform_ai_analysis` method of the main window with that option.
 
         Example:
         {
@@ -59,33 +114,16 @@ class MenuCreator:
         }
         """
         try:
-            for main_menu_name, main_submenus in self.main_window.menus.items():
-                main_menu = self.main_window.menuBar().addMenu(main_menu_name)
-                logger.info(f"Created main menu: {main_menu_name}")
-                for submenu_name, submenus in main_submenus.items():
-                    if isinstance(submenus, dict):
-                        submenu = main_menu.addMenu(submenu_name)
-                        logger.info(f"Created submenu: {submenu_name}")
-                        for subsubmenu_name, options in submenus.items():
-                            subsubmenu = submenu.addMenu(subsubmenu_name)
-                            logger.info(f"Created subsubmenu: {subsubmenu_name}")
-                            for option in options:
-                                action = QAction(option, self.main_window)
-                                action.triggered.connect(
-                                    lambda checked, o=option: self.main_window.perform_ai_analysis(o)
-                                )
-                                subsubmenu.addAction(action)
-                                logger.info(f"Added action: {option} to subsubmenu: {subsubmenu_name}")
-                    else:
-                        submenu = main_menu.addMenu(submenu_name)
-                        logger.info(f"Created submenu: {submenu_name}")
-                        for option in submenus:
-                            action = QAction(option, self.main_window)
-                            action.triggered.connect(
-                                lambda checked, o=option: self.main_window.perform_ai_analysis(o)
-                            )
-                            submenu.addAction(action)
-                            logger.info(f"Added action: {option} to submenu: {submenu_name}")
+            perform_ai_analysis = self.main_window.perform_ai_analysis
+            menus = {(): self.main_window.menuBar()}
+
+            for path, kind, payload in self.main_window.menu_spec:
+                parent = menus[path]
+                if kind == SUBMENU:
+                    menus[path + (payload,)] = parent.addMenu(payload)
+                else:
+                    parent.addAction(AIAction(payload, perform_ai_analysis, self.main_window))
+            logger.info(f"Created {len(menus) - 1} menus from {len(self.main_window.menu_spec)} menu entries")
         except Exception as e:
             logger.error(f"Error creating menus in MenuCreator: {e}")
             self.main_window.statusBar().showMessage("Failed to create menus. Check logs for details.")
@@ -25,6 +25,8 @@ class SignalConnector:
             - view_saved_chats_button.clicked -> view_saved_chats
             - save_chat_button.clicked -> save_chat_to_history
             - simulation_btn.clicked -> start_simulation
+            - model_combo.currentTextChanged -> model_changed
+            - context_length_spinner.valueChanged -> update_context_length
     """
     def __init__(self, main_window):
         """
@@ -52,6 +54,8 @@ class SignalConnector:
         - view_saved_chats_button: Connects to view_saved_chats method.
         - save_chat_button: Connects to save_chat_to_history method.
         - simulation_btn: Connects to start_simulation method.
+        - model_combo (on current text changed): Connects to model_changed method.
+        - context_length_spinner (on value changed): Connects to update_context_length method.
         """
         try:
             self.main_window.stats_button.clicked.connect(self.main_window.show_statistics)
@@ -90,6 +94,12 @@ class SignalConnector:
             self.main_window.simulation_btn.clicked.connect(self.main_window.start_simulation)
             logger.info("Connected simulation_btn to start_simulation")
 
+            self.main_window.model_combo.currentTextChanged.connect(self.main_window.model_changed)
+            logger.info("Connected model_combo currentTextChanged to model_changed")
+
+            self.main_window.context_length_spinner.valueChanged.connect(self.main_window.update_context_length)
+            logger.info("Connected context_length_spinner valueChanged to update_context_length")
+
         except AttributeError as e:
             logger.error(f"AttributeError while connecting signals: {e}")
         except Exception as e:
@@ -1,22 +1,267 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableView, QLabel, QHeaderView, QAbstractItemView
 import json
+import marshal
 import os
-from datetime import datetime
+import sys
 from QtOllama.utility.logger_setup import create_logger
 
+try:
+    # orjson parses the stats file several times faster; its JSONDecodeError subclasses json's
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Errors raised for a malformed stats file; ijson reports them with its own exception type
+if ijson is not None:
+    JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+else:
+    JSON_ERRORS = (json.JSONDecodeError,)
+
 logger = create_logger(__name__)
 
+# Rows emitted to the model per insert while loading
+ROWS_PER_CHUNK = 500
+
+
+def columns_path(stats_file):
+    """
+    Returns the path of the columnar cache kept next to a stats file.
+
+    Args:
+        stats_file (str): The path of the stats file.
+
+    Returns:
+        str: The path of the cache file.
+    """
+    return f"{os.path.splitext(stats_file)[0]}.columns"
+
+
+def read_stats_columns(stats_file):
+    """
+    Loads the flattened stats columns saved by a previous load.
+
+    The columns are stored with marshal, which reads three flat lists of strings far faster
+    than the JSON can be parsed and flattened again.
+
+    Args:
+        stats_file (str): The path of the stats file.
+
+    Returns:
+        dict: The cache, with the "timestamps", "keys" and "values" columns, the "source"
+            (st_mtime_ns, st_size) of the stats file they came from, and the "end" offset and
+            "tail" bytes of the array's last entry; or None if there is no usable cache.
+    """
+    try:
+        with open(columns_path(stats_file), "rb") as f:
+            cached = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error loading stats columns: {e}")
+        return None
+    return cached if isinstance(cached, dict) and "source" in cached else None
+
+
+def read_appended_stats(stats_file, cached, size):
+    """
+    Parses only the snapshots appended to the stats file since the cache was written.
+
+    save_stats appends by replacing the closing bracket of the JSON array with a comma and
+    the new snapshot, so the bytes before the cached end offset are unchanged and the new
+    snapshots follow it after a comma.
+
+    Args:
+        stats_file (str): The path of the stats file.
+        cached (dict): The cache returned by read_stats_columns.
+        size (int): The current size of the stats file.
+
+    Returns:
+        list: The appended stats entries, or None if the file was changed in any other way.
+    """
+    end, tail = cached.get("end"), cached.get("tail")
+    if end is None or tail is None or size <= cached["source"][1]:
+        return None
+    with open(stats_file, "rb") as f:
+        f.seek(end - len(tail))
+        data = f.read()
+    if data[:len(tail)] != tail:
+        return None
+    appended = data[len(tail):].lstrip()
+    if not appended.startswith(b","):
+        return None
+    return _loads(b"[" + appended[1:])
+
+
+def write_stats_columns(stats_file, source, columns):
+    """
+    Saves the flattened stats columns for the next load.
+
+    Along with the columns, the offset just past the array's last entry and the bytes
+    before it are recorded, so the next load can tell whether the file was only appended
+    to. The file is written next to the cache and swapped in with os.replace, so a
+    reader never sees a partially written cache.
+
+    Args:
+        stats_file (str): The path of the stats file.
+        source (tuple): The (st_mtime_ns, st_size) of the stats file the columns came from.
+        columns (tuple): The (timestamps, keys, values) lists.
+    """
+    try:
+        size = source[1]
+        with open(stats_file, "rb") as f:
+            f.seek(max(0, size - 64))
+            window = f.read(min(size, 64))
+        bracket = window.rfind(b"]")
+        end = tail = None
+        if bracket != -1:
+            content = window[:bracket].rstrip()
+            end = size - len(window) + len(content)
+            tail = content[-32:]
+        path = columns_path(stats_file)
+        tmp_path = f"{path}.tmp"
+        timestamps, keys, values = columns
+        with open(tmp_path, "wb") as f:
+            marshal.dump({"source": source, "end": end, "tail": tail,
+                          "timestamps": timestamps, "keys": keys, "values": values}, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error saving stats columns: {e}")
+
+
+def iter_historical_stats(stats_file):
+    """
+    Yields the historical stats entries one by one.
+
+    With ijson installed the file is parsed incrementally, so each entry can be flattened
+    into rows as soon as it is read and the whole list is never held in memory. Otherwise
+    it is parsed in one go with orjson or json. Repeated loads are served by the columnar
+    cache, so the parsed list is not kept once the loader is done with it.
+
+    Args:
+        stats_file (str): The path of the stats file.
+
+    Yields:
+        dict: One saved stats snapshot.
+    """
+    with open(stats_file, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from _loads(f.read())
+
+
+def value_sort_key(value):
+    """
+    Returns a key that orders stat values numerically where they are numbers.
+
+    Values are stored as the text shown in the statistics table, so "9.5" would sort after
+    "10.2" as plain text. Numbers sort before text values such as "8th and 9th grade".
+
+    Args:
+        value (str): The stored value.
+
+    Returns:
+        tuple: The sort key.
+    """
+    try:
+        return 0, float(value), value
+    except ValueError:
+        return 1, 0.0, value
+
+
+class HistoricalStatsModel(QAbstractTableModel):
+    """
+    A table model over the historical stats, one (timestamp, statistic, value) row per stat.
+
+    The rows are plain tuples; the view only asks for the cells it shows, so no item object
+    is created per cell. Values keep their saved text and are only compared as numbers when
+    the view sorts by them.
+
+    Attributes:
+        headers (list): The column headers.
+        rows (list): The (timestamp, statistic, value) tuples.
+    """
+    headers = ["Timestamp", "Statistic", "Value"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def set_rows(self, rows):
+        """
+        Replaces all rows in one model reset.
+
+        Args:
+            rows (list): The (timestamp, statistic, value) tuples to show.
+        """
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """
+        Appends rows at the end of the model in one insert.
+
+        Args:
+            rows (list): The (timestamp, statistic, value) tuples to add.
+        """
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        Sorts the rows in place by one column, comparing values numerically.
+
+        Args:
+            column (int): The column to sort by.
+            order (Qt.SortOrder): The sort direction.
+        """
+        if column == 2:
+            key = lambda row: value_sort_key(row[2])
+        else:
+            key = lambda row: row[column]
+        self.layoutAboutToBeChanged.emit()
+        self.rows.sort(key=key, reverse=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
+
+
 class HistoricalStatsDialog(QDialog):
     """
     A dialog window that displays historical statistics in a table format.
     Attributes:
         label (QLabel): A label to display instructions.
-        table (QTableWidget): A table to display the historical stats.
+        model (HistoricalStatsModel): The model holding the historical stats.
+        table (QTableView): A table to display the historical stats.
+        loader (StatsLoader): The worker reading the stats file, if one was started.
     Methods:
         __init__(parent=None):
             Initializes the HistoricalStatsDialog with a title, size, and layout.
         load_stats():
-            Loads the historical stats from a JSON file and populates the table.
+            Starts loading the historical stats from a JSON file into the table.
     """
     def __init__(self, parent=None):
         """
@@ -37,13 +282,23 @@ class HistoricalStatsDialog(QDialog):
             layout.addWidget(self.label)
             
             # Table to display the stats
-            self.table = QTableWidget(0, 3)
-            self.table.setHorizontalHeaderLabels(["Timestamp", "Statistic", "Value"])
+            self.model = HistoricalStatsModel(self)
+            self.table = QTableView(self)
+            self.table.setModel(self.model)
+            # Fixed row heights let the view map scroll positions to rows without measuring
+            # each one, so only the visible window of rows is ever queried from the model
+            vertical_header = self.table.verticalHeader()
+            vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            vertical_header.setDefaultSectionSize(self.table.fontMetrics().height() + 6)
+            self.table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+            # Cells are single-line values, so no wrapped text has to be measured
+            self.table.setWordWrap(False)
             layout.addWidget(self.table)
             
             self.setLayout(layout)
             
             # Load and display stats
+            self.loader = None
             self.load_stats()
         except Exception as e:
             logger.error(f"Error constructing HistoricalStatsDialog: {e}", exc_info=True)
@@ -54,12 +309,9 @@ class HistoricalStatsDialog(QDialog):
         This method reads historical statistics from a JSON file named 
         'historical_stats.json'. If the file does not exist, it updates 
         the label to indicate that no historical stats are available. 
-        Otherwise, it populates a table with the historical stats, where 
-        each entry includes a timestamp and associated key-value pairs.
-        The table is updated with each entry's timestamp, key, and value.
-        Raises:
-            json.JSONDecodeError: If the JSON file contains invalid JSON.
-            OSError: If there is an issue opening or reading the file.
+        Otherwise, it starts a StatsLoader that reads and flattens the file off
+        the GUI thread; its rows are appended to the model as they arrive, so the
+        dialog paints immediately and large files are shown progressively.
         """
         stats_file = "historical_stats.json"
         if not os.path.exists(stats_file):
@@ -67,26 +319,153 @@ class HistoricalStatsDialog(QDialog):
             logger.warning(f"Stats file {stats_file} does not exist.")
             return
         
+        self.label.setText("Loading historical stats...")
+        self.model.set_rows([])
+        self.loader = StatsLoader(stats_file)
+        self.loader.rows_loaded.connect(self.model.append_rows)
+        self.loader.error_occurred.connect(self.label.setText)
+        self.loader.loaded.connect(self.handle_stats_loaded)
+        self.loader.start()
+    
+    def handle_stats_loaded(self):
+        """
+        Restores the instructions label and enables sorting once every row has been loaded.
+
+        Sorting starts on the timestamp column in ascending order, which is the order the
+        stats were saved in.
+        """
+        self.label.setText("Showing historical stats over time:")
+        self.table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+    
+    def done(self, result):
+        """
+        Stops a running loader before the dialog closes.
+        
+        Args:
+            result (int): The dialog result code.
+        """
+        if self.loader is not None and self.loader.isRunning():
+            self.loader.requestInterruption()
+            self.loader.wait()
+        super().done(result)
+
+
+class StatsLoader(QThread):
+    """
+    Reads and flattens the historical stats file on a worker thread.
+    
+    Attributes:
+        rows_loaded (pyqtSignal): Emitted with each chunk of (timestamp, statistic, value) rows.
+        loaded (pyqtSignal): Emitted once every row has been emitted.
+        error_occurred (pyqtSignal): Emitted with a message for the dialog label if loading fails.
+    Args:
+        stats_file (str): The path of the stats file.
+    """
+    rows_loaded = pyqtSignal(list)
+    loaded = pyqtSignal()
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, stats_file):
+        super().__init__()
+        self.stats_file = stats_file
+    
+    def run(self):
+        """
+        Emits the rows of the stats file ROWS_PER_CHUNK at a time.
+        
+        Rows come from the columnar cache when it was written for the current stats file.
+        If snapshots were only appended since then, just those are parsed and added to the
+        cached columns. Otherwise the JSON is parsed, its rows are emitted as they are
+        flattened, and the columns are saved for the next load.
+        """
+        stats_file = self.stats_file
         try:
-            with open(stats_file, "r") as f:
-                historical_stats = json.load(f)
-            
-            # Populate the table with the historical stats
-            for entry in historical_stats:
-                timestamp = entry.get("timestamp", "Unknown Time")
-                for key, value in entry.items():
-                    if key != "timestamp":
-                        row = self.table.rowCount()
-                        self.table.insertRow(row)
-                        self.table.setItem(row, 0, QTableWidgetItem(timestamp))
-                        self.table.setItem(row, 1, QTableWidgetItem(key))
-                        self.table.setItem(row, 2, QTableWidgetItem(str(value)))
-        except json.JSONDecodeError as e:
-            self.label.setText("Error loading stats: Invalid JSON format.")
+            st = os.stat(stats_file)
+            source = (st.st_mtime_ns, st.st_size)
+            cached = read_stats_columns(stats_file)
+            entries = None
+            if cached is not None and cached["source"] != source:
+                entries = read_appended_stats(stats_file, cached, st.st_size)
+                if entries is None:
+                    cached = None
+            if cached is not None:
+                columns = cached["timestamps"], cached["keys"], cached["values"]
+                for start in range(0, len(columns[2]), ROWS_PER_CHUNK):
+                    if self.isInterruptionRequested():
+                        return
+                    self.emit_rows(columns, start, start + ROWS_PER_CHUNK)
+            else:
+                columns = [], [], []
+                entries = iter_historical_stats(stats_file)
+            if entries is not None:
+                if not self.add_entries(entries, columns):
+                    return
+                write_stats_columns(stats_file, source, columns)
+            self.loaded.emit()
+        except JSON_ERRORS as e:
+            self.error_occurred.emit("Error loading stats: Invalid JSON format.")
             logger.error(f"JSONDecodeError while loading stats from {stats_file}: {e}", exc_info=True)
         except OSError as e:
-            self.label.setText("Error loading stats: Unable to read file.")
+            self.error_occurred.emit("Error loading stats: Unable to read file.")
             logger.error(f"OSError while reading stats file {stats_file}: {e}", exc_info=True)
         except Exception as e:
-            self.label.setText("Error loading stats: An unexpected error occurred.")
+            self.error_occurred.emit("Error loading stats: An unexpected error occurred.")
             logger.error(f"Unexpected error while loading stats: {e}", exc_info=True)
+    
+    def add_entries(self, entries, columns):
+        """
+        Flattens stats entries onto the end of the timestamp, statistic and value columns.
+        
+        Rows are emitted every ROWS_PER_CHUNK so the table fills while the entries are parsed.
+        Timestamps are shown exactly as save_stats formatted them and are never parsed into
+        datetimes; each is looked up and interned once per snapshot and shared by its rows.
+        
+        Args:
+            entries (iterable): The stats entries, one dict per saved snapshot.
+            columns (tuple): The (timestamps, keys, values) lists to extend.
+        
+        Returns:
+            bool: False if the loader was interrupted, True otherwise.
+        """
+        # Timestamps repeat for every stat of a snapshot and stat names repeat across all
+        # snapshots, so they are interned to share one string object per distinct value
+        intern = sys.intern
+        timestamps, keys, values = columns
+        emitted = len(values)
+        # Snapshots nearly always share one set of stats, so the stat names are worked out
+        # once and each snapshot is indexed by them; they are recomputed when a snapshot
+        # has a different number of stats or lacks one of them
+        stat_keys = []
+        for entry in entries:
+            if self.isInterruptionRequested():
+                return False
+            timestamp = intern(str(entry.get("timestamp", "Unknown Time")))
+            if len(entry) != len(stat_keys) + 1:
+                stat_keys = [intern(key) for key in entry if key != "timestamp"]
+            try:
+                entry_values = [str(entry[key]) for key in stat_keys]
+            except KeyError:
+                stat_keys = [intern(key) for key in entry if key != "timestamp"]
+                entry_values = [str(entry[key]) for key in stat_keys]
+            timestamps.extend([timestamp] * len(stat_keys))
+            keys.extend(stat_keys)
+            values.extend(entry_values)
+            if len(values) - emitted >= ROWS_PER_CHUNK:
+                self.emit_rows(columns, emitted, len(values))
+                emitted = len(values)
+        if len(values) > emitted:
+            self.emit_rows(columns, emitted, len(values))
+        return True
+    
+    def emit_rows(self, columns, start, end):
+        """
+        Emits one slice of the columns as (timestamp, statistic, value) rows.
+        
+        Args:
+            columns (tuple): The (timestamps, keys, values) lists.
+            start (int): The first row to emit.
+            end (int): The row after the last one to emit.
+        """
+        timestamps, keys, values = columns
+        self.rows_loaded.emit(list(zip(timestamps[start:end], keys[start:end], values[start:end])))
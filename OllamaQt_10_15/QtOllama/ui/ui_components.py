@@ -1,7 +1,11 @@
 # ui_components.py
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTextEdit, QLineEdit, QPushButton, QStatusBar, QProgressBar
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPlainTextEdit, QLineEdit, QPushButton, QStatusBar, QProgressBar,
+    QSpinBox
 )
+from PyQt6.QtGui import QTextCursor
+from QtOllama.ui.chat_highlighter import ChatHighlighter
+from QtOllama.utility.constants import CHAT_MAX_BLOCKS, CONTEXT_LENGTH_DEFAULT, CONTEXT_LENGTH_MIN, CONTEXT_LENGTH_MAX
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
@@ -37,7 +41,8 @@ class UIComponents:
         Initializes the user interface components for the main window.
         This method sets up the main layout and various UI elements including:
         - A combo box for model selection.
-        - A text edit area for chat display.
+        - A spin box for the context length sent to the model.
+        - A plain text area for chat display, bounded to CHAT_MAX_BLOCKS lines.
         - An input field and send button for user input.
         - Multiple buttons for various functionalities such as:
             - Saving chat
@@ -49,7 +54,7 @@ class UIComponents:
             - Viewing statistics
             - Generating word cloud
             - Viewing historical stats
-        - A status bar with a status message, progress bar, and additional info label.
+        - A status bar with one permanent widget holding the status message, progress bar, and additional info label.
         The layout is organized using QVBoxLayout and QHBoxLayout to structure the widgets.
         """
         try:
@@ -58,10 +63,29 @@ class UIComponents:
             top_layout = QHBoxLayout()
             model_label = QLabel("Select Model:")
             self.main_window.model_combo = QComboBox()
+            self.main_window.model_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+            # All items are one line of text, so the popup can size them from the first one
+            self.main_window.model_combo.view().setUniformItemSizes(True)
             top_layout.addWidget(model_label)
             top_layout.addWidget(self.main_window.model_combo)
-
-            self.main_window.chat_display = QTextEdit()
+            context_label = QLabel("Context Length:")
+            self.main_window.context_length_spinner = QSpinBox()
+            self.main_window.context_length_spinner.setRange(CONTEXT_LENGTH_MIN, CONTEXT_LENGTH_MAX)
+            self.main_window.context_length_spinner.setSingleStep(CONTEXT_LENGTH_MIN)
+            self.main_window.context_length_spinner.setValue(CONTEXT_LENGTH_DEFAULT)
+            top_layout.addWidget(context_label)
+            top_layout.addWidget(self.main_window.context_length_spinner)
+
+            self.main_window.chat_display = QPlainTextEdit()
+            self.main_window.chat_display.setMaximumBlockCount(CHAT_MAX_BLOCKS)
+            # The transcript is only written by the app, so keystrokes never edit or relayout it
+            self.main_window.chat_display.setReadOnly(True)
+            # Every streamed insert would otherwise be kept on the undo stack
+            self.main_window.chat_display.setUndoRedoEnabled(False)
+            self.main_window.chat_highlighter = ChatHighlighter(self.main_window.chat_display.document())
+            # Streamed chunks are inserted through this cursor instead of copying the widget's cursor
+            self.main_window.stream_cursor = QTextCursor(self.main_window.chat_display.document())
+            self.main_window.stream_cursor.movePosition(QTextCursor.MoveOperation.End)
 
             input_layout = QHBoxLayout()
             self.main_window.input_field = QLineEdit()
@@ -109,9 +133,9 @@ class UIComponents:
             self.main_window.status_layout = QHBoxLayout(self.main_window.status_widget)
             self.main_window.status_layout.addWidget(self.main_window.status_message)
             self.main_window.status_layout.addWidget(self.main_window.progress_bar)
-            self.main_window.status_bar.addPermanentWidget(self.main_window.status_widget)
             self.main_window.info_label = QLabel(self.main_window)
-            self.main_window.status_bar.addPermanentWidget(self.main_window.info_label)
+            self.main_window.status_layout.addWidget(self.main_window.info_label)
+            self.main_window.status_bar.addPermanentWidget(self.main_window.status_widget)
             self.main_window.setStatusBar(self.main_window.status_bar)
 
             logger.info("UI initialized successfully.")
@@ -10,6 +10,38 @@ from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
 
+def fold_word_counts(word_counts):
+    """
+    Merges word counts that differ only in case or by a trailing plural "s".
+
+    The counts come from WordCloud.process_text run message by message, which folds case
+    and plurals within each message only. This applies the same rules across messages:
+    each word is shown in its most common case, and a plural is counted under its
+    singular when the singular occurs too.
+
+    Args:
+        word_counts (Mapping[str, int]): Counts keyed by word or collocation.
+
+    Returns:
+        dict: The folded counts.
+    """
+    forms = {}
+    for word, count in word_counts.items():
+        forms.setdefault(word.lower(), {})[word] = count
+    folded = {}
+    for key, cased in forms.items():
+        if key.endswith("s") and not key.endswith("ss") and key[:-1] in forms:
+            continue
+        cased = dict(cased)
+        plural = forms.get(key + "s")
+        if plural is not None and not key.endswith("s"):
+            for word, count in plural.items():
+                singular = word[:-1]
+                cased[singular] = cased.get(singular, 0) + count
+        folded[max(cased, key=cased.get)] = sum(cased.values())
+    return folded
+
+
 class WordCloudDialog(FramelessDialog, QDialog):
     """
     A dialog window for displaying and regenerating a word cloud based on the text from a given text editor widget.
@@ -19,26 +51,31 @@ class WordCloudDialog(FramelessDialog, QDialog):
         graphics_view (QGraphicsView): The view for displaying the word cloud.
         generate_button (QPushButton): The button to regenerate the word cloud.
     Methods:
-        __init__(text_edit_widget, parent=None):
-            Initializes the WordCloudDialog with the given text editor widget and optional parent widget.
+        __init__(text_edit_widget, parent=None, word_counts=None):
+            Initializes the WordCloudDialog with the given text editor widget, optional parent widget
+            and optional precomputed word counts.
         generate_word_cloud():
             Generates a word cloud from the text in the text editor widget and displays it in the graphics view.
     """
     
-    def __init__(self, text_edit_widget, parent=None):
+    def __init__(self, text_edit_widget, parent=None, word_counts=None):
         """
         Initializes the WordCloudDialog.
         Args:
             text_edit_widget (QTextEdit): The text edit widget containing the text for the word cloud.
             parent (QWidget, optional): The parent widget. Defaults to None.
+            word_counts (Counter, optional): Word counts of the text. When given, the text is not
+                tokenized again. Defaults to None.
         Attributes:
             text_edit_widget (QTextEdit): Stores the reference to the text edit widget.
+            word_counts (Counter): The precomputed word counts, or None.
             layout (QVBoxLayout): The layout manager for the dialog.
             graphics_view (QGraphicsView): The view for displaying the word cloud.
             generate_button (QPushButton): The button to regenerate the word cloud.
         """
         super().__init__(parent)
         self.text_edit_widget = text_edit_widget
+        self.word_counts = word_counts
         self.setWindowTitle("Word Cloud")
         self.resize(600, 600)
         
@@ -61,8 +98,8 @@ class WordCloudDialog(FramelessDialog, QDialog):
         """
         Generates a word cloud from the text in the text editor and displays it in the graphics view.
         This method performs the following steps:
-        1. Retrieves text from the text editor widget.
-        2. Generates a word cloud image using the retrieved text.
+        1. Retrieves text from the text editor widget, unless word counts were provided.
+        2. Generates a word cloud image from the word counts or the retrieved text.
         3. Creates a matplotlib figure to display the word cloud.
         4. Saves the figure to a BytesIO object.
         5. Converts the saved image to a QPixmap.
@@ -72,12 +109,20 @@ class WordCloudDialog(FramelessDialog, QDialog):
             and the graphics view is accessible via `self.graphics_view`.
         """
         try:
-            # Get text from the text editor
-            text = self.text_edit_widget.toPlainText()
-            logger.debug("Retrieved text from text editor widget.")
-            
-            # Generate word cloud
-            wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+            wordcloud = WordCloud(width=800, height=400, background_color='white')
+            if self.word_counts is not None:
+                frequencies = fold_word_counts(self.word_counts)
+            else:
+                # Get text from the text editor
+                text = self.text_edit_widget.toPlainText()
+                logger.debug("Retrieved text from text editor widget.")
+                frequencies = wordcloud.process_text(text)
+            if not frequencies:
+                # WordCloud raises when it has no words to place
+                logger.info("No words to build a word cloud from.")
+                self.graphics_view.setScene(QGraphicsScene(self))
+                return
+            wordcloud.generate_from_frequencies(frequencies)
             logger.debug("Generated word cloud.")
             
             # Create a matplotlib figure
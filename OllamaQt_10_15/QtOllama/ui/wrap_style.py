@@ -1,3 +1,6 @@
+# wrap_style.py
+import re
+
 stylesheet = """
 /* /////////////////////////////////////////////////////////////////////
 QWidget
@@ -74,9 +77,10 @@ border:2px solid rgb(200, 200, 200);
 }
 
 /* /////////////////////////////////////////////////////////////////////
-QTextEdit
+QTextEdit/QPlainTextEdit
 ///////////////////////////////////////////////////////////////////// */
-QTextEdit {
+QTextEdit,
+QPlainTextEdit {
 border-radius:10px;
 padding:6px 6px;
 border:2px solid rgb(200, 200, 200);
@@ -108,13 +112,15 @@ background:rgb(250,250,250);
 
 
 /* /////////////////////////////////////////////////////////////////////
-QTextEdit/QLineEdit
+QTextEdit/QPlainTextEdit/QLineEdit
 ///////////////////////////////////////////////////////////////////// */
 QTextEdit:hover,
+QPlainTextEdit:hover,
 QLineEdit:hover {
 border:2px solid #444;
 }
 QTextEdit:focus,
+QPlainTextEdit:focus,
 QLineEdit:focus {
 border:2px solid rgb(24, 24, 24);
 }
@@ -463,3 +469,9 @@ background:rgb(225,225,225);
 
 
 """
+
+# Qt parses the stylesheet once per setStyleSheet, in time linear in its length. The source
+# above stays readable; the comments and layout whitespace are stripped once here, at import.
+stylesheet = re.sub(r"/\*.*?\*/", "", stylesheet, flags=re.S)
+stylesheet = re.sub(r"\s+", " ", stylesheet)
+stylesheet = re.sub(r"\s*([{};,])\s*", r"\1", stylesheet).strip()
@@ -1,2 +1,31 @@
 # constants.py
-CONTEXT_LENGTH_DEFAULT = 8192
\ No newline at end of file
+CONTEXT_LENGTH_DEFAULT = 8192
+CONTEXT_LENGTH_MIN = 512
+CONTEXT_LENGTH_MAX = 131072
+# a context length picked with the spinner is applied once it has been unchanged for this long
+CONTEXT_LENGTH_DEBOUNCE_MS = 250
+# keep_alive=-1 keeps the model loaded on the server between requests
+KEEP_ALIVE = -1
+NUM_BATCH = 512
+# streamed chunks are drawn at most once per frame (~30 fps)
+STREAM_FLUSH_INTERVAL_MS = 33
+# the response task batches chunks up to this many characters before signalling the GUI
+STREAM_BATCH_CHARS = 4096
+# the chat transcript drops its oldest lines beyond this many blocks
+CHAT_MAX_BLOCKS = 10_000
+# text statistics are recomputed once the text has been unchanged for this long
+STATS_DEBOUNCE_MS = 400
+# below this many characters the text statistics are meaningless and are not computed
+STATS_MIN_CHARS = 20
+# rough number of characters per model token, used to estimate token counts without a tokenizer
+CHARS_PER_TOKEN = 4
+# once the messages outgrow the context length they are trimmed down to this fraction of it
+TRIM_LOW_WATERMARK = 0.6
+# responses are requested uncompressed, so no decoder holds streamed chunks back
+OLLAMA_HEADERS = {"Accept-Encoding": "identity"}
+# requests to an unreachable server fail after this many seconds instead of hanging
+OLLAMA_CONNECT_TIMEOUT_S = 5
+# a request fails once the server has sent nothing for this many seconds (a model load can take a while)
+OLLAMA_READ_TIMEOUT_S = 300
+# closing the window waits this long for running tasks before leaving them to finish on their own
+POOL_SHUTDOWN_TIMEOUT_MS = 2000
@@ -0,0 +1,63 @@
+# model_cache.py
+import hashlib
+import json
+import os
+import time
+
+from QtOllama.utility.logger_setup import create_logger
+logger = create_logger(__name__)
+
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), ".cache", "quillama")
+
+
+def cache_path():
+    """
+    Returns the path of the model list cache for the configured Ollama server.
+
+    The server address is hashed into the file name, so pointing OLLAMA_HOST at a
+    different server never shows the model list of the previous one.
+
+    Returns:
+        str: The path of the cache file.
+    """
+    host = os.environ.get("OLLAMA_HOST", "")
+    host_hash = hashlib.sha1(host.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIRECTORY, f"models-{host_hash}.json")
+
+
+def load_cached_models():
+    """
+    Loads the model names saved by the last successful model listing.
+
+    Returns:
+        list: The cached model names, or an empty list if there is no usable cache.
+    """
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f).get("models", [])
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        logger.error(f"Error loading model cache: {e}")
+        return []
+
+
+def save_cached_models(model_names):
+    """
+    Saves the model names to the cache file.
+
+    The file is written next to the cache and swapped in with os.replace, so a
+    reader never sees a partially written cache.
+
+    Args:
+        model_names (list): The model names reported by the Ollama server.
+    """
+    try:
+        path = cache_path()
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"models": model_names, "mtime": time.time()}, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error saving model cache: {e}")
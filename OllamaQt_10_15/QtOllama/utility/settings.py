@@ -8,17 +8,29 @@ from PyQt6.QtWidgets import QDialog, QVBoxLayout, QGroupBox, QLabel, QLineEdit,
 
 
 # settings.py
+import copy
 import json
 import os
 
 from QtOllama.utility.logger_setup import create_logger
+
+try:
+    # orjson parses settings.json faster; its JSONDecodeError subclasses json's
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 logger = create_logger(__name__)
 
+# The last parsed settings file, reused while its modification time and size are unchanged
+_SETTINGS_CACHE = {"key": None, "data": None}
+
 
 def load_settings():
     """
     Loads settings from a JSON file named 'settings.json'. If the file does not exist,
-    it returns default settings.
+    it returns default settings. The parsed file is kept in memory and only read again
+    once it changes on disk. Callers get a copy, so changing it never alters the cache.
 
     Returns:
         dict: A dictionary containing the settings.
@@ -30,8 +42,13 @@ def load_settings():
     try:
         settings_file = "settings.json"
         if os.path.exists(settings_file):
-            with open(settings_file, 'r') as f:
-                settings = json.load(f)
+            st = os.stat(settings_file)
+            key = (st.st_mtime_ns, st.st_size)
+            if _SETTINGS_CACHE["key"] != key:
+                with open(settings_file, 'rb') as f:
+                    _SETTINGS_CACHE["data"] = _loads(f.read())
+                _SETTINGS_CACHE["key"] = key
+            settings = copy.deepcopy(_SETTINGS_CACHE["data"])
         else:
             # Default settings
             settings = {
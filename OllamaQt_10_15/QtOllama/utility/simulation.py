@@ -1,11 +1,13 @@
 # simulation.py
 import logging
+import queue
+import threading
 import time
 import traceback
 import json
 
 import ollama
-from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import (
     QDialog,
@@ -22,10 +24,23 @@ from PyQt6.QtWidgets import (
     QGridLayout,
     QMessageBox,
 )
-from QtOllama.utility.settings import load_settings
+from QtOllama.utility.constants import (
+    OLLAMA_CONNECT_TIMEOUT_S,
+    OLLAMA_HEADERS,
+    OLLAMA_READ_TIMEOUT_S,
+    POOL_SHUTDOWN_TIMEOUT_MS,
+    STREAM_FLUSH_INTERVAL_MS,
+)
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
+# The fixed part of the simulation's system prompt
+SYSTEM_MESSAGE_BASE = (
+    "Function as a turn-based, role-playing simulation. Remember, this is a game of interaction, "
+    "and after every turn, the simulation will pause allowing the user to interact. The simulation "
+    "will never break out of the scenario."
+)
+
 
 def messages_to_prompt(messages):
     """
@@ -74,6 +89,8 @@ class SimWorker(QThread):
     """
     SimWorker is a QThread subclass responsible for handling the simulation of message processing
     using a specified model. It emits signals for new messages, completion, and errors.
+    One worker lives for the whole simulation: each turn is submitted to its queue, and the
+    thread and its Ollama client are reused instead of being created again per turn.
     Attributes:
         new_message (pyqtSignal): Signal emitted when a new message chunk is received.
                                   Parameters are the message content (str), a boolean indicating
@@ -82,24 +99,67 @@ class SimWorker(QThread):
                                        Parameters are the complete message (str) and the start time (float).
         error (pyqtSignal): Signal emitted when an error occurs. Parameter is the error message (str).
     Args:
-        messages (list): List of messages to be processed.
         model_name (str): Name of the model to be used for processing messages.
     Methods:
-        run(): Executes the message processing simulation, emitting signals for new message chunks,
-               completion, and errors.
+        submit(messages): Queues a snapshot of the conversation for the next turn.
+        stop(): Lets the worker finish once the queued turns are done.
+        cancel(): Abandons the current turn and any queued ones.
+        run(): Processes queued turns until stopped.
+        generate(client, messages): Executes one turn of the simulation, emitting signals for new
+               message chunks, completion, and errors.
     """
     new_message = pyqtSignal(str, bool, float)
     complete_message = pyqtSignal(str, float)
     error = pyqtSignal(str)
     
     def __init__(self,
-                 messages: list,
                  model_name: str):
         super().__init__()
-        self.messages = messages
         self.model_name = model_name  # Store the model name
+        self.requests = queue.Queue()
+        self.cancelled = threading.Event()
+    
+    def submit(self, messages):
+        """
+        Queues a turn for the worker.
+
+        Args:
+            messages (list): The conversation so far; a copy is queued, so later changes to the
+                list do not affect the turn.
+        """
+        self.requests.put(list(messages))
+    
+    def stop(self):
+        """
+        Asks the worker to finish once the queued turns are done.
+        """
+        self.requests.put(None)
+    
+    def cancel(self):
+        """
+        Asks the worker to finish as soon as possible.
+
+        The stream of the current turn is closed at its next chunk, and turns still in the
+        queue are skipped.
+        """
+        self.cancelled.set()
+        self.requests.put(None)
     
     def run(self):
+        """
+        Processes queued turns with one Ollama client until stop() or cancel() is called.
+        """
+        import httpx
+
+        timeout = httpx.Timeout(OLLAMA_READ_TIMEOUT_S, connect=OLLAMA_CONNECT_TIMEOUT_S)
+        client = ollama.Client(headers=OLLAMA_HEADERS, timeout=timeout)
+        while True:
+            messages = self.requests.get()
+            if messages is None or self.cancelled.is_set():
+                break
+            self.generate(client, messages)
+    
+    def generate(self, client, messages):
         """
         Executes the simulation by generating responses based on the provided messages.
         This method performs the following steps:
@@ -116,6 +176,9 @@ class SimWorker(QThread):
             new_message (str, bool, float): Emitted for each chunk of the response.
             complete_message (str, float): Emitted after all chunks are processed.
             error (str): Emitted if an exception occurs during execution.
+        Args:
+            client (ollama.Client): The client shared by all turns of the worker.
+            messages (list): The conversation to respond to.
         Logs:
             Various debug and error messages related to the request and response processing.
         Raises:
@@ -123,15 +186,20 @@ class SimWorker(QThread):
         """
         start_time = time.time()
         try:
-            prompt = messages_to_prompt(self.messages)
+            prompt = messages_to_prompt(messages)
             logging.debug(f"Ollama Request: model={self.model_name}, prompt={prompt}")
             
-            responses = ollama.generate(model=self.model_name, prompt=prompt, stream=True)
+            responses = client.generate(model=self.model_name, prompt=prompt, stream=True)
             
             first_chunk = True
-            result = ""
+            # Collected and joined once; += would copy the growing response for every token
+            parts = []
             
             for chunk in responses:
+                if self.cancelled.is_set():
+                    # Closing the generator closes the HTTP stream behind it
+                    responses.close()
+                    return
                 logger.debug(f"Type of chunk: {type(chunk)}")
                 logger.debug(f"Chunk received: {chunk}")
                 # Handle chunk
@@ -147,18 +215,22 @@ class SimWorker(QThread):
                 else:
                     logger.error(f"Unexpected chunk type: {type(chunk)}")
                     content = ''
-                result += content
+                parts.append(content)
                 self.new_message.emit(content, first_chunk, start_time)
                 first_chunk = False
             
             # After the loop, the generation is complete
-            self.complete_message.emit(result, start_time)
+            self.complete_message.emit("".join(parts), start_time)
         except Exception as e:
             self.error.emit(
                 f"Error on sim worker: {e}, Trace: {traceback.format_exc()}"
             )
 
 
+# Cancelled workers that outlived the dialog's close, kept alive until their thread ends
+_retired_workers = set()
+
+
 class SimulationDialog(QDialog):
     """    
     SimulationDialog is a QDialog subclass that facilitates a turn-based, role-playing simulation
@@ -170,6 +242,9 @@ class SimulationDialog(QDialog):
         character_edit (QLineEdit): Input field for the character name.
         messages (list): List to store messages exchanged during the simulation.
         ai_response_edit (QTextEdit): Text edit widget to display AI responses.
+        ai_cursor (QTextCursor): Cursor kept at the end of ai_response_edit for writing the transcript.
+        pending_chunks (list): Response chunks waiting to be written to ai_response_edit.
+        flush_timer (QTimer): Timer that writes the pending chunks.
         user_input_edit (QLineEdit): Input field for user messages.
         send_button (QPushButton): Button to send user input.
         input_layout (QHBoxLayout): Layout for user input field and send button.
@@ -187,10 +262,16 @@ class SimulationDialog(QDialog):
         initialize_simulation(self):
         handle_dialog_finished(self, result):
         process_sim_worker(self):
-            Processes the simulation worker with the selected model.
+            Submits the conversation to the simulation worker, starting it on the first turn.
+        done(self, result):
+            Stops the simulation worker before the dialog closes.
         handle_worker_error(self, error_message):
         send_user_input(self, user_text=None):
         update_ai_response(self, ai_response, is_first_chunk, start_time):
+        flush_ai_response(self):
+            Writes the pending response chunks in one insert.
+        scroll_to_end(self):
+            Scrolls the text editor to the newest text.
         update_conversation_history(self, full_response, start_time):
     """
     def __init__(self, text_editor, parent=None, selected_model=None):
@@ -204,6 +285,14 @@ class SimulationDialog(QDialog):
         self.ai_response_edit = QTextEdit(self)
         self.ai_response_edit.setReadOnly(True)
         self.ai_response_edit.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
+        # All transcript text goes through this cursor, which therefore stays at the end
+        self.ai_cursor = QTextCursor(self.ai_response_edit.document())
+        self.ai_cursor.movePosition(QTextCursor.MoveOperation.End)
+        
+        self.pending_chunks = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(STREAM_FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush_ai_response)
         
         self.user_input_edit = QLineEdit(self)
 
@@ -359,19 +448,18 @@ class SimulationDialog(QDialog):
                 
                 self.setWindowTitle(f"Simulation: {character}—{location}—{year}")
                 
-                system_message = """
-                Function as a turn-based, role-playing simulation. Remember, this is a game of interaction,
-                and after every turn, the simulation will pause allowing the user to interact. The simulation
-                will never break out of the scenario."""
+                system_parts = [SYSTEM_MESSAGE_BASE]
                 
                 if scenario_notes is not None:
-                    system_message += (
-                        f"\n\nAdditional simulation scenario notes: {scenario_notes}"
+                    system_parts.append(
+                        f"Additional simulation scenario notes: {scenario_notes}"
                     )
                 
                 if include_editor_contents:
                     editor_contents = self.get_editor_contents()
-                    system_message += f"\n\nAdditional information: {editor_contents}"
+                    system_parts.append(f"Additional information: {editor_contents}")
+                
+                system_message = "\n\n".join(system_parts)
                 
                 initial_user_message = f"""
                 \n\nIn this simulation, I am {character.strip()}, currently in {location.strip()},
@@ -410,16 +498,13 @@ class SimulationDialog(QDialog):
     
     def process_sim_worker(self):
         """
-        Processes the simulation worker by initializing and starting a new SimWorker instance.
+        Submits the conversation history to the simulation worker.
         This method performs the following steps:
         1. Determines the model to use based on the selected model or defaults to 'llama2'.
         2. Displays the progress bar.
-        3. Cleans up any existing SimWorker instance by quitting, waiting for it to finish, 
-           and disconnecting its signals.
-        4. Creates a new SimWorker instance with the conversation history and the determined model name.
-        5. Connects the new SimWorker's signals to the appropriate slots for handling new messages, 
-           completed messages, and errors.
-        6. Starts the new SimWorker instance.
+        3. On the first turn, creates the SimWorker with the determined model name, connects its
+           signals to the slots for new messages, completed messages, and errors, and starts it.
+        4. Submits the conversation history to the worker.
         """
         # Use the selected model
         if self.selected_model:
@@ -429,20 +514,39 @@ class SimulationDialog(QDialog):
         
         self.progress_bar.show()
         
-        # Clean up existing worker if it exists
-        if self.sim_worker:
-            self.sim_worker.quit()
-            self.sim_worker.wait()
-            self.sim_worker.new_message.disconnect()
-            self.sim_worker.error.disconnect()
-            self.sim_worker.complete_message.disconnect()
-        
-        # Create new SimWorker with model_name
-        self.sim_worker = SimWorker(self.conversation_history, model_name)
-        self.sim_worker.new_message.connect(self.update_ai_response)
-        self.sim_worker.complete_message.connect(self.update_conversation_history)
-        self.sim_worker.error.connect(self.handle_worker_error)
-        self.sim_worker.start()
+        # The worker is started once and reused for every turn
+        if self.sim_worker is None:
+            self.sim_worker = SimWorker(model_name)
+            self.sim_worker.new_message.connect(self.update_ai_response)
+            self.sim_worker.complete_message.connect(self.update_conversation_history)
+            self.sim_worker.error.connect(self.handle_worker_error)
+            self.sim_worker.start()
+        self.sim_worker.submit(self.conversation_history)
+    
+    def done(self, result):
+        """
+        Cancels the simulation worker before the dialog closes.
+
+        The worker's signals are disconnected so nothing more reaches the dialog, and the
+        close waits at most POOL_SHUTDOWN_TIMEOUT_MS for the stream to be closed. A worker
+        still blocked on the server after that is kept in _retired_workers until it
+        finishes, so the thread is never destroyed while it runs.
+
+        Args:
+            result (int): The dialog result code.
+        """
+        worker = self.sim_worker
+        if worker is not None:
+            self.sim_worker = None
+            worker.cancel()
+            worker.new_message.disconnect()
+            worker.complete_message.disconnect()
+            worker.error.disconnect()
+            if not worker.wait(POOL_SHUTDOWN_TIMEOUT_MS):
+                logger.info("Simulation worker still running; leaving it to finish")
+                _retired_workers.add(worker)
+                worker.finished.connect(lambda: _retired_workers.discard(worker))
+        super().done(result)
     
     @pyqtSlot(str)
     def handle_worker_error(self, error_message):
@@ -474,16 +578,23 @@ class SimulationDialog(QDialog):
         """
         user_text = user_text or self.user_input_edit.text()
         if user_text.strip():
+            # Chunks still waiting for the timer belong before the user's line
+            self.flush_ai_response()
+            self.flush_timer.stop()
             new_message = {"role": "user", "content": user_text}
             self.conversation_history.append(new_message)
-            self.ai_response_edit.append("\n👤 " + user_text)
+            self.ai_cursor.insertText("\n\n👤 " + user_text)
+            self.scroll_to_end()
             self.user_input_edit.clear()
             self.process_sim_worker()
     
     @pyqtSlot(str, bool, float)
     def update_ai_response(self, ai_response, is_first_chunk, start_time):
         """
-        Updates the AI response in the text editor.
+        Queues a chunk of the AI response for the text editor.
+
+        The chunk is written by flush_ai_response on the next timer tick, so a fast model
+        costs one layout and repaint per tick rather than one per token.
 
         Args:
             ai_response (str): The response generated by the AI.
@@ -497,9 +608,32 @@ class SimulationDialog(QDialog):
         if ai_response.strip() != "":
             if is_first_chunk:
                 ai_response = "\n\n🌐 " + ai_response
-            self.ai_response_edit.insertPlainText(ai_response)
-            self.ai_response_edit.moveCursor(QTextCursor.MoveOperation.End)
-            self.ai_response_edit.ensureCursorVisible()
+            self.pending_chunks.append(ai_response)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+    
+    def flush_ai_response(self):
+        """
+        Writes the pending response chunks to the end of the text editor in one insert.
+
+        The text goes through ai_cursor as plain text, so no rich-text detection runs and
+        the editor's own cursor is never moved. The timer is stopped once there is nothing
+        left to write, and restarted by the next chunk.
+        """
+        if not self.pending_chunks:
+            self.flush_timer.stop()
+            return
+        text = "".join(self.pending_chunks)
+        self.pending_chunks.clear()
+        self.ai_cursor.insertText(text)
+        self.scroll_to_end()
+    
+    def scroll_to_end(self):
+        """
+        Scrolls the text editor to the newest text.
+        """
+        scroll_bar = self.ai_response_edit.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
     
     @pyqtSlot(str, float)
     def update_conversation_history(self,
@@ -512,7 +646,8 @@ class SimulationDialog(QDialog):
             full_response (str): The full response content from the assistant.
             start_time (float): The start time of the response generation.
         """
+        self.flush_ai_response()
+        self.flush_timer.stop()
         new_message = {"role": "assistant", "content": full_response.strip()}
         self.conversation_history.append(new_message)
-        self.ai_response_edit.ensureCursorVisible()
         self.progress_bar.hide()
@@ -1,38 +1,273 @@
 import os
 import json
-import textstat as textstat
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QThread, QTimer, Qt, pyqtSignal
 from PyQt6.QtWidgets import QDialog, \
     QTextEdit, \
     QVBoxLayout, \
     QTableWidget, \
     QTableWidgetItem, \
     QHeaderView
-from nltk import word_tokenize
-from textblob import TextBlob
 from datetime import datetime
 from QtOllama.utility.interpretations import Interpretations
+from QtOllama.utility.constants import STATS_DEBOUNCE_MS, STATS_MIN_CHARS
 from QtOllama.utility.logger_setup import create_logger
 logger = create_logger(__name__)
 
 
+def append_historical_stats(stats_file, stats):
+    """
+    Appends one stats snapshot to the JSON array in the stats file.
+
+    The array's closing bracket is overwritten by a comma and the new snapshot and written
+    again after it, so only the snapshot is written rather than the whole history being read and
+    rewritten. The historical stats dialog relies on this to parse just the appended
+    snapshots. The layout matches json.dump with indent=4.
+
+    Args:
+        stats_file (str): The path of the stats file, created if it does not exist.
+        stats (dict): The snapshot to append.
+
+    Raises:
+        ValueError: If the file does not end with a JSON array.
+    """
+    entry = json.dumps(stats, indent=4).replace("\n", "\n    ")
+    if not os.path.exists(stats_file) or os.path.getsize(stats_file) == 0:
+        with open(stats_file, "w") as f:
+            f.write(f"[\n    {entry}\n]")
+        return
+    with open(stats_file, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 64))
+        window = f.read()
+        bracket = window.rfind(b"]")
+        if bracket == -1:
+            raise ValueError(f"{stats_file} does not end with a JSON array")
+        content = window[:bracket].rstrip()
+        separator = "\n    " if content.endswith(b"[") else ",\n    "
+        f.seek(size - len(window) + len(content))
+        f.truncate()
+        f.write(f"{separator}{entry}\n]".encode("utf-8"))
+
+
+def compute_statistics(text):
+    """
+    Computes the token counts, readability scores and sentiment of a text.
+    The following statistics are calculated:
+    - Characters: Total number of characters in the text.
+    - Letters: Total number of letters in the text, ignoring spaces.
+    - Words: Total number of words in the text.
+    - Unique words: Total number of unique words in the text.
+    - Difficult Words: Total number of difficult words in the text.
+    - Syllables: Total number of syllables in the text.
+    - Mono Syllables: Total number of monosyllabic words in the text.
+    - Poly Syllables: Total number of polysyllabic words in the text.
+    - Sentences: Total number of sentences in the text.
+    - Lines: Total number of lines in the text.
+    - Paragraphs: Total number of paragraphs in the text.
+    - Total tokens: Total number of tokens in the text.
+    - Unique tokens: Total number of unique tokens in the text.
+    - Lexical diversity: Ratio of unique tokens to total tokens.
+    - Sentiment Polarity: Sentiment polarity score of the text.
+    - Sentiment Subjectivity: Sentiment subjectivity score of the text.
+    - Flesch Reading Ease: Flesch Reading Ease score of the text.
+    - Flesch-Kincaid Grade Level: Flesch-Kincaid Grade Level score of the text.
+    - Smog Index: SMOG index of the text.
+    - Gunning Fog: Gunning Fog index of the text.
+    - Automated Readability Index: Automated Readability Index of the text.
+    - Text Standards: Text standard score of the text.
+    - Spache Readability Formula: Spache Readability Formula score of the text.
+    - McAlpine EFLAW Readability Score: McAlpine EFLAW Readability Score of the text.
+    - Dale-Chall Readability Score: Dale-Chall Readability Score of the text.
+    - Linsear Write Formula: Linsear Write Formula score of the text.
+    - Coleman-Liau Index: Coleman-Liau Index of the text.
+    - Estimated Reading Time (minutes): Estimated reading time for the text.
+
+    Args:
+        text (str): The text to compute the statistics for.
+
+    Returns:
+        list: (statistic name, raw value, interpretation) tuples, one per table row.
+    """
+    # Imported here rather than with the module: they take a while to load and are only
+    # needed once statistics are computed
+    import textstat
+    from nltk import word_tokenize
+    from textblob import TextBlob
+    
+    # how many tokens in the text?
+    tokens = word_tokenize(text)
+    total_tokens = len(tokens)
+    unique_tokens = len(set(tokens))
+    # todo ask coco or chatty for help with a better explanation here
+    lexical_diversity = unique_tokens / total_tokens if total_tokens > 0 else 0
+    # basic MS WORD stats :D
+    # textstat memoizes its counts per text, so the readability formulas below reuse the
+    # sentence, word and syllable counts computed here as long as they are all given this
+    # same text object; do not strip or slice it for individual calls
+    characters = len(text)
+    letters = textstat.letter_count(text, ignore_spaces=True)
+    words = textstat.lexicon_count(text)
+    sentences = textstat.sentence_count(text)
+    syllables = textstat.syllable_count(text)
+    newlines = text.count("\n")
+    lines = newlines + 1 if text else 0
+    # Returns the Flesch-Kincaid Grade of the given text. This is a grade formula in that a
+    # score of 9.3 means that a ninth grader would be able to read the document.
+    # https://en.wikipedia.org/wiki/Flesch–Kincaid_readability_tests#Flesch–Kincaid_grade_level
+    flesch_reading_ease = textstat.flesch_reading_ease(text)
+    reading_ease_interpretation = Interpretations.flesch_reading_ease_interpretation(
+        flesch_reading_ease)
+    flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
+    flesch_kincaid_grade_interpretation = Interpretations.flesch_kincaid_grade_interpretation(
+        flesch_kincaid_grade)
+    
+    # Returns the SMOG index of the given text. This is a grade formula in that a score of 9.3
+    # means that a ninth grader would be able to read the document.
+    # Texts of fewer than 30 sentences are statistically invalid, because the SMOG formula was
+    # normed on 30-sentence samples. textstat requires at least 3 sentences for a result.
+    # https://en.wikipedia.org/wiki/SMOG
+    smog_index = textstat.smog_index(text)
+    
+    # Returns the FOG index of the given text. This is a grade formula in that a score of 9.3
+    # means that a ninth grader would be able to read the document.
+    # https://en.wikipedia.org/wiki/Gunning_fog_index
+    gunning_fog = textstat.gunning_fog(text)
+    gunning_fog_interpretation = Interpretations.gunning_fog_index_interpretation(gunning_fog)
+    
+    # Returns the ARI (Automated Readability Index) which outputs a number that approximates
+    # the grade level needed to comprehend the text.
+    # For example if the ARI is 6.5, then the grade level to comprehend the text is 6th to 7th
+    # grade.
+    # https://en.wikipedia.org/wiki/Automated_readability_index
+    automated_readability_index = textstat.automated_readability_index(text)
+    
+    # Different from other tests, since it uses a lookup table of the most commonly used 3000
+    # English words. Thus it returns the grade level using the New Dale-Chall Formula.
+    # https://en.wikipedia.org/wiki/Dale–Chall_readability_formula
+    dale_chall_readability_score = textstat.dale_chall_readability_score(text)
+    difficult_words = textstat.difficult_words(text)
+    spache_read = textstat.spache_readability(text)
+    text_standards = textstat.text_standard(text, float_output=False)
+    linsear_write_formula = textstat.linsear_write_formula(text)
+    coleman_liau_index = textstat.coleman_liau_index(text)
+    coleman_liau_index_interpretation = Interpretations.coleman_liau_index_interpretation(
+        coleman_liau_index)
+    reading_time = textstat.reading_time(text, ms_per_char=2)
+    blob = TextBlob(text)
+    sentiment_polarity = round(blob.sentiment.polarity, 2)
+    sentiment_polarity_interpretation = Interpretations.sentiment_polartiy_interpretation(
+        sentiment_polarity)
+    sentiment_subjectivity = round(blob.sentiment.subjectivity, 2)
+    sentiment_subjectivity_interpretation = Interpretations.sentiment_subjectivity_interpretation(
+        sentiment_subjectivity)
+    # Same tokenizer on the same text, so the unique words are the unique tokens
+    unique_words = unique_tokens
+    mono_syl = textstat.monosyllabcount(text)
+    poly_syl = textstat.polysyllabcount(text)
+    mcalpine = textstat.mcalpine_eflaw(text)
+    
+    # A paragraph break needs two newlines, so the second scan is skipped when there
+    # cannot be one
+    number_of_paragraphs = text.count("\n\n") if newlines > 1 else 0
+    
+    stats = [
+        ("Characters", characters, ""),
+        ("Letters", letters, ""),
+        ("Words", words, ""),
+        ("Unique words", unique_words, ""),
+        ("Difficult Words", difficult_words, ""),
+        ("Syllables", syllables, ""),
+        ("Mono Syllables", mono_syl, ""),
+        ("Poly Syllables", poly_syl, ""),
+        ("Sentences", sentences, ""),
+        ("Lines", lines, ""),
+        ("Paragraphs", number_of_paragraphs, ""),
+        ("Total tokens", total_tokens, ""),
+        ("Unique tokens", unique_tokens, ""),
+        ("Lexical diversity", lexical_diversity, ""),
+        ("Sentiment Polarity", sentiment_polarity, sentiment_polarity_interpretation),
+        ("Sentiment Subjectivity", sentiment_subjectivity,
+         sentiment_subjectivity_interpretation),
+        ("Flesch Reading Ease", flesch_reading_ease, reading_ease_interpretation),
+        ("Flesch-Kincaid Grade Level", flesch_kincaid_grade,
+         flesch_kincaid_grade_interpretation),
+        ("Smog Index", smog_index, ""),
+        ("Gunning Fog", gunning_fog, gunning_fog_interpretation),
+        ("Automated Readability Index", automated_readability_index, ""),
+        ("Text Standards", text_standards, ""),
+        ("Spache Readability Formula", spache_read, ""),
+        ("McAlpine EFLAW Readability Score", mcalpine, ""),
+        ("Dale-Chall Readability Score", dale_chall_readability_score, ""),
+        ("Linsear Write Formula", linsear_write_formula, ""),
+        ("Coleman-Liau Index", coleman_liau_index, coleman_liau_index_interpretation),
+        ("Estimated Reading Time (minutes)", reading_time, ""),
+        
+    ]
+    return stats
+
+
+class StatsWorker(QThread):
+    """
+    Computes the statistics of a snapshot of the text away from the GUI thread.
+
+    Attributes:
+        done (pyqtSignal): Signal emitted with the list of statistics once they are computed.
+        text (str): The text the statistics are computed for.
+        stats (list): The computed statistics, or None until they are done.
+    """
+    done = pyqtSignal(list)
+    
+    def __init__(self, text, parent=None):
+        """
+        Initializes the worker with the text to compute the statistics for.
+
+        Args:
+            text (str): The text to compute the statistics for.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.text = text
+        self.stats = None
+    
+    def run(self):
+        """
+        Computes the statistics, keeps them in stats and emits them.
+        """
+        try:
+            stats = compute_statistics(self.text)
+        except Exception as e:
+            logger.error(f"Error computing text statistics: {e}")
+            return
+        self.stats = stats
+        self.done.emit(stats)
+
+
 class StatsDialog(QDialog):
     """
     A dialog window that displays real-time text statistics for a given QTextEdit widget.
     Attributes:
         text_edit_widget (QTextEdit): The text edit widget whose statistics are to be displayed.
-        timer (QTimer): A timer to periodically update the statistics.
+        timer (QTimer): A single-shot timer that updates the statistics once the text settles.
         table (QTableWidget): A table widget to display the statistics.
+        last_text_hash (int): The hash of the text the table was last computed for.
+        worker (StatsWorker): The worker computing the statistics, if one is running.
+        update_pending (bool): Whether the text changed while the worker was running.
     Methods:
         __init__(text_edit_widget: QTextEdit, parent=None):
             Initializes the StatsDialog with the given QTextEdit widget and optional parent.
         update_statistics():
-            Updates the statistics displayed in the table based on the current text in the text_edit_widget.
+            Starts a StatsWorker for the current text in the text_edit_widget.
+        populate_table(stats):
+            Shows the statistics computed by the worker in the table.
         save_stats():
             Saves the current statistics to a JSON file with a timestamp.
+        showEvent(event) / hideEvent(event):
+            Resume and pause the updates while the dialog is shown or hidden.
         closeEvent(event):
             Handles the close event by saving the current statistics before closing the dialog.
     """
+    headers = ["Statistic", "Raw Value", "Interpretation"]
+    
     def __init__(self, text_edit_widget: QTextEdit, parent=None):
         """
         Initializes the statistics window for real-time text statistics.
@@ -42,11 +277,18 @@ class StatsDialog(QDialog):
         Attributes:
             text_edit_widget (QTextEdit): The text edit widget to monitor.
             table (QTableWidget): The table widget to display statistics.
-            timer (QTimer): Timer to update statistics every second.
+            timer (QTimer): Timer restarted by every text change that updates the statistics
+                once the text has been unchanged for STATS_DEBOUNCE_MS.
+            last_text_hash (int): The hash of the text the table was last computed for.
+            worker (StatsWorker): The worker computing the statistics, if one is running.
+            update_pending (bool): Whether the text changed while the worker was running.
         """
         super().__init__(parent)
         
         self.text_edit_widget = text_edit_widget
+        self.last_text_hash = None
+        self.worker = None
+        self.update_pending = False
         
         self.setWindowTitle("Real-Time Text Statistics")
         
@@ -57,9 +299,13 @@ class StatsDialog(QDialog):
         layout = QVBoxLayout()
         
         # create tableWidget to display stats
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Statistic", "Raw Value", "Interpretation"])
+        self.table = QTableWidget(0, len(self.headers))
+        self.table.setHorizontalHeaderLabels(self.headers)
         self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         
         # add tableWidget to the layout
         layout.addWidget(self.table)
@@ -67,173 +313,84 @@ class StatsDialog(QDialog):
         # set the layout to the layout which was the QVBoxLayout, fun right? :D
         self.setLayout(layout)
         
-        # does things I need to ask about cause I didn't make this part of the app I'm modding it
-        # but I assume it's an auto time to update the statistics
-        # I wish the op developer would've maybe(I PROLLY DELETED THEM ACTUALLY) been more clear?
-        # but I admire the fuck out of them anyways so yeah FUCK ME for derping here,
-        # todo better comment here :D
+        # Recompute when the text changes instead of polling: every change restarts the
+        # single-shot timer, so a burst of edits or streamed chunks costs one update. The
+        # document is only connected while the dialog is shown (see showEvent/hideEvent)
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(STATS_DEBOUNCE_MS)
         self.timer.timeout.connect(self.update_statistics)
-        self.timer.start(1000)
+        # The first update imports the NLP libraries, so it runs once the dialog is shown
+        QTimer.singleShot(0, self.update_statistics)
     
     def update_statistics(self):
         """
         Updates the statistics of the text present in the text edit widget.
-        This method calculates various statistics and readability scores for the text present in the 
-        text edit widget and updates a table with these values. The statistics include token counts, 
-        lexical diversity, character counts, syllable counts, sentence counts, readability scores, 
-        sentiment analysis, and more.
-        The following statistics are calculated and displayed:
-        - Characters: Total number of characters in the text.
-        - Letters: Total number of letters in the text, ignoring spaces.
-        - Words: Total number of words in the text.
-        - Unique words: Total number of unique words in the text.
-        - Difficult Words: Total number of difficult words in the text.
-        - Syllables: Total number of syllables in the text.
-        - Mono Syllables: Total number of monosyllabic words in the text.
-        - Poly Syllables: Total number of polysyllabic words in the text.
-        - Sentences: Total number of sentences in the text.
-        - Lines: Total number of lines in the text.
-        - Paragraphs: Total number of paragraphs in the text.
-        - Total tokens: Total number of tokens in the text.
-        - Unique tokens: Total number of unique tokens in the text.
-        - Lexical diversity: Ratio of unique tokens to total tokens.
-        - Sentiment Polarity: Sentiment polarity score of the text.
-        - Sentiment Subjectivity: Sentiment subjectivity score of the text.
-        - Flesch Reading Ease: Flesch Reading Ease score of the text.
-        - Flesch-Kincaid Grade Level: Flesch-Kincaid Grade Level score of the text.
-        - Smog Index: SMOG index of the text.
-        - Gunning Fog: Gunning Fog index of the text.
-        - Automated Readability Index: Automated Readability Index of the text.
-        - Text Standards: Text standard score of the text.
-        - Spache Readability Formula: Spache Readability Formula score of the text.
-        - McAlpine EFLAW Readability Score: McAlpine EFLAW Readability Score of the text.
-        - Dale-Chall Readability Score: Dale-Chall Readability Score of the text.
-        - Linsear Write Formula: Linsear Write Formula score of the text.
-        - Coleman-Liau Index: Coleman-Liau Index of the text.
-        - Estimated Reading Time (minutes): Estimated reading time for the text.
-        The method updates a table with these statistics, where each row represents a different 
-        statistic, and the columns represent the statistic name, raw value, and interpretation (if 
-        applicable).
+        The statistics are computed by a StatsWorker (see compute_statistics) and shown by
+        populate_table once it is done. At most one worker runs: a change made while it is busy
+        is picked up by worker_finished once it is done, since the computation cannot be
+        aborted. Nothing is recomputed while the text is unchanged since the last update. Nothing is computed while the dialog is hidden, and the table
+        is emptied while the text is shorter than STATS_MIN_CHARS.
         """
+        if not self.isVisible():
+            return
         
         # grabbing the text from the textWidget // chat_window so that them sexy stats can sassy on
         text = self.text_edit_widget.toPlainText()
+        text_hash = hash(text)
+        if text_hash == self.last_text_hash:
+            return
+        if self.worker is not None:
+            self.update_pending = True
+            return
+        self.last_text_hash = text_hash
+        if len(text) < STATS_MIN_CHARS:
+            self.table.setRowCount(0)
+            return
         
-        # how many tokens in the text?
-        tokens = word_tokenize(text)
-        total_tokens = len(tokens)
-        unique_tokens = len(set(tokens))
-        # todo ask coco or chatty for help with a better explanation here
-        lexical_diversity = unique_tokens / total_tokens if total_tokens > 0 else 0
-        # basic MS WORD stats :D
-        characters = len(text)
-        letters = textstat.letter_count(text, ignore_spaces=True)
-        words = textstat.lexicon_count(text)
-        sentences = textstat.sentence_count(text)
-        syllables = textstat.syllable_count(text)
-        lines = text.count("\n") + 1 if text else 0
-        # Returns the Flesch-Kincaid Grade of the given text. This is a grade formula in that a
-        # score of 9.3 means that a ninth grader would be able to read the document.
-        # https://en.wikipedia.org/wiki/Flesch–Kincaid_readability_tests#Flesch–Kincaid_grade_level
-        flesch_reading_ease = textstat.flesch_reading_ease(text)
-        reading_ease_interpretation = Interpretations.flesch_reading_ease_interpretation(
-            flesch_reading_ease)
-        flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
-        flesch_kincaid_grade_interpretation = Interpretations.flesch_kincaid_grade_interpretation(
-            flesch_kincaid_grade)
-        
-        # Returns the SMOG index of the given text. This is a grade formula in that a score of 9.3
-        # means that a ninth grader would be able to read the document.
-        # Texts of fewer than 30 sentences are statistically invalid, because the SMOG formula was
-        # normed on 30-sentence samples. textstat requires at least 3 sentences for a result.
-        # https://en.wikipedia.org/wiki/SMOG
-        smog_index = textstat.smog_index(text)
-        
-        # Returns the FOG index of the given text. This is a grade formula in that a score of 9.3
-        # means that a ninth grader would be able to read the document.
-        # https://en.wikipedia.org/wiki/Gunning_fog_index
-        gunning_fog = textstat.gunning_fog(text)
-        gunning_fog_interpretation = Interpretations.gunning_fog_index_interpretation(gunning_fog)
-        
-        # Returns the ARI (Automated Readability Index) which outputs a number that approximates
-        # the grade level needed to comprehend the text.
-        # For example if the ARI is 6.5, then the grade level to comprehend the text is 6th to 7th
-        # grade.
-        # https://en.wikipedia.org/wiki/Automated_readability_index
-        automated_readability_index = textstat.automated_readability_index(text)
-        
-        # Different from other tests, since it uses a lookup table of the most commonly used 3000
-        # English words. Thus it returns the grade level using the New Dale-Chall Formula.
-        # https://en.wikipedia.org/wiki/Dale–Chall_readability_formula
-        dale_chall_readability_score = textstat.dale_chall_readability_score(text)
-        difficult_words = textstat.difficult_words(text)
-        spache_read = textstat.spache_readability(text)
-        text_standards = textstat.text_standard(text, float_output=False)
-        linsear_write_formula = textstat.linsear_write_formula(text)
-        coleman_liau_index = textstat.coleman_liau_index(text)
-        coleman_liau_index_interpretation = Interpretations.coleman_liau_index_interpretation(
-            coleman_liau_index)
-        reading_time = textstat.reading_time(text, ms_per_char=2)
-        blob = TextBlob(text)
-        sentiment_polarity = round(blob.sentiment.polarity, 2)
-        sentiment_polarity_interpretation = Interpretations.sentiment_polartiy_interpretation(
-            sentiment_polarity)
-        sentiment_subjectivity = round(blob.sentiment.subjectivity, 2)
-        sentiment_subjectivity_interpretation = Interpretations.sentiment_subjectivity_interpretation(
-            sentiment_subjectivity)
-        unique_words = len(set(word_tokenize(text)))
-        mono_syl = textstat.monosyllabcount(text)
-        poly_syl = textstat.polysyllabcount(text)
-        mcalpine = textstat.mcalpine_eflaw(text)
-        
-        number_of_paragraphs = text.count("\n\n")
-        
-        stats = [
-            ("Characters", characters, ""),
-            ("Letters", letters, ""),
-            ("Words", words, ""),
-            ("Unique words", unique_words, ""),
-            ("Difficult Words", difficult_words, ""),
-            ("Syllables", syllables, ""),
-            ("Mono Syllables", mono_syl, ""),
-            ("Poly Syllables", poly_syl, ""),
-            ("Sentences", sentences, ""),
-            ("Lines", lines, ""),
-            ("Paragraphs", number_of_paragraphs, ""),
-            ("Total tokens", total_tokens, ""),
-            ("Unique tokens", unique_tokens, ""),
-            ("Lexical diversity", lexical_diversity, ""),
-            ("Sentiment Polarity", sentiment_polarity, sentiment_polarity_interpretation),
-            ("Sentiment Subjectivity", sentiment_subjectivity,
-             sentiment_subjectivity_interpretation),
-            ("Flesch Reading Ease", flesch_reading_ease, reading_ease_interpretation),
-            ("Flesch-Kincaid Grade Level", flesch_kincaid_grade,
-             flesch_kincaid_grade_interpretation),
-            ("Smog Index", smog_index, ""),
-            ("Gunning Fog", gunning_fog, gunning_fog_interpretation),
-            ("Automated Readability Index", automated_readability_index, ""),
-            ("Text Standards", text_standards, ""),
-            ("Spache Readability Formula", spache_read, ""),
-            ("McAlpine EFLAW Readability Score", mcalpine, ""),
-            ("Dale-Chall Readability Score", dale_chall_readability_score, ""),
-            ("Linsear Write Formula", linsear_write_formula, ""),
-            ("Coleman-Liau Index", coleman_liau_index, coleman_liau_index_interpretation),
-            ("Estimated Reading Time (minutes)", reading_time, ""),
-            
-        ]
-        
-        self.table.setRowCount(len(stats))
-        for i, (stat_name, raw_value, interpretation) in enumerate(stats):
-            self.table.setItem(i, 0, QTableWidgetItem(stat_name))
-            self.table.setItem(i, 1, QTableWidgetItem(str(raw_value)))
-            self.table.setItem(i, 2, QTableWidgetItem(interpretation))
-        
-        self.table.horizontalHeader().setSectionResizeMode(0,
-                                                           QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1,
-                                                           QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.worker = StatsWorker(text, self)
+        self.worker.done.connect(self.populate_table)
+        self.worker.finished.connect(self.worker_finished)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.worker.start()
+    
+    def worker_finished(self):
+        """
+        Forgets the worker once it has finished, whether or not it produced a result,
+        and starts the update the text changed for while it was running.
+        """
+        if self.sender() is not self.worker:
+            return
+        self.worker = None
+        if self.update_pending:
+            self.update_pending = False
+            self.update_statistics()
+    
+    def populate_table(self, stats):
+        """
+        Shows the statistics computed by the worker in the table.
+        The table's items are created on the first update and only have their text replaced
+        afterwards, with repainting held back until every cell is set.
+
+        Args:
+            stats (list): (statistic name, raw value, interpretation) tuples, one per row.
+        """
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            if table.rowCount() != len(stats):
+                table.setRowCount(len(stats))
+                for i in range(len(stats)):
+                    for j in range(3):
+                        table.setItem(i, j, QTableWidgetItem())
+            for i, (stat_name, raw_value, interpretation) in enumerate(stats):
+                table.item(i, 0).setText(stat_name)
+                table.item(i, 1).setText(str(raw_value))
+                table.item(i, 2).setText(interpretation)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
     
     def save_stats(self):
         """
@@ -246,9 +403,8 @@ class StatsDialog(QDialog):
         Steps:
         1. Collects statistics from the table.
         2. Adds a timestamp to the collected statistics.
-        3. Loads existing statistics from the JSON file if it exists.
-        4. Appends the new statistics to the historical list.
-        5. Saves the updated list back to the JSON file.
+        3. Appends the new statistics to the historical list in the JSON file, writing
+           only the new entry (see append_historical_stats).
         Raises:
             IOError: If there is an error reading from or writing to the JSON file.
         Prints:
@@ -263,36 +419,65 @@ class StatsDialog(QDialog):
             stat_name = self.table.item(row, 0).text()
             raw_value = self.table.item(row, 1).text()
             stats[stat_name] = raw_value
+        if not stats:
+            # Nothing was computed, e.g. the text was too short
+            return
         
         # Add a timestamp to the stats
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         stats["timestamp"] = timestamp
         
-        # Load existing stats if the file exists
-        if os.path.exists(stats_file):
-            with open(stats_file, "r") as f:
-                historical_stats = json.load(f)
-        else:
-            historical_stats = []
-        
-        # Append HammerAI-lama-3_1-storm-latest stats to the historical list
-        historical_stats.append(stats)
-        
-        # Save the updated stats back to the file
-        with open(stats_file, "w") as f:
-            json.dump(historical_stats, f, indent=4)
+        # Append the stats to the historical list without rewriting it
+        append_historical_stats(stats_file, stats)
         
         print(f"Stats saved at {timestamp}")
     
+    def showEvent(self, event):
+        """
+        Follows the text's changes while the dialog is shown, and schedules an update since
+        changes made while it was hidden were not computed.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super().showEvent(event)
+        self.text_edit_widget.document().contentsChanged.connect(
+            self.timer.start, Qt.ConnectionType.UniqueConnection
+        )
+        self.timer.start()
+    
+    def hideEvent(self, event):
+        """
+        Stops following the text and drops a pending update when the dialog is hidden, so
+        a closed dialog leaves no connection behind on the chat's document.
+
+        Args:
+            event (QHideEvent): The hide event.
+        """
+        try:
+            self.text_edit_widget.document().contentsChanged.disconnect(self.timer.start)
+        except TypeError:
+            pass
+        self.timer.stop()
+        super().hideEvent(event)
+    
     def closeEvent(self, event):
         """
         Handles the close event for the window.
 
         This method is called when the window is about to be closed. It ensures
-        that the current statistics are saved before the window is closed.
+        that the current statistics are saved before the window is closed. A running
+        worker is waited for and its result shown first, since its done signal would
+        only reach the table after the save.
 
         Args:
             event (QCloseEvent): The close event that triggered this method.
         """
+        if self.worker is not None:
+            # The worker is owned by the dialog, so it must not outlive it
+            self.update_pending = False
+            self.worker.wait()
+            if self.worker.stats is not None:
+                self.populate_table(self.worker.stats)
         self.save_stats()
         super().closeEvent(event)
@@ -1,5 +1,6 @@
 import sys
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication, QStyleFactory
 
 from QtOllama.quilLlama import MainWindow
@@ -13,13 +14,17 @@ logger = create_logger(__name__)
 
 def run_app():
     try:
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents, True)
         app = QApplication(sys.argv)
-        app.setStyleSheet(stylesheet)
-        window = MainWindow()
+        app.setEffectEnabled(Qt.UIEffect.UI_AnimateCombo, False)
+        # Style and stylesheet are set once on the application, before any widget exists,
+        # so they are parsed once and every widget is polished with them on creation
         try:
-            window.setStyle(QStyleFactory.create("Fusion"))
+            app.setStyle(QStyleFactory.create("Fusion"))
         except Exception as style_error:
             logger.error(f"{style_error}")
+        app.setStyleSheet(stylesheet)
+        window = MainWindow()
         window.show()
         sys.exit(app.exec())
     except Exception as main_error: